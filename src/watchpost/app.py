@@ -620,10 +620,12 @@ class Watchpost:
             ValueError:
                 If an unsupported annotation is encountered.
         """
-        if (
-            resolved_instantiable_datasources
-            := self._resolved_instantiable_datasources.get(check)
-        ):
+        # Compare against `None`: a check without datasources resolves to an
+        # empty mapping, which must be reused just like any other result.
+        resolved_instantiable_datasources = self._resolved_instantiable_datasources.get(
+            check
+        )
+        if resolved_instantiable_datasources is not None:
             return resolved_instantiable_datasources
 
         instantiable_datasources = {}
@@ -683,7 +685,8 @@ class Watchpost:
         Returns:
             An ordered list of `SchedulingStrategy` objects to evaluate.
         """
-        if resolved_strategies := self._resolved_strategies.get(check):
+        resolved_strategies = self._resolved_strategies.get(check)
+        if resolved_strategies is not None:
             return resolved_strategies
 
         strategies = []
@@ -754,6 +757,10 @@ class Watchpost:
         """
         if self._check_scheduling_verified and not force:
             return
+        if force:
+            # Resolve the strategies anew, which also makes strategies that
+            # memoize their validation per resolved list re-validate.
+            self._resolved_strategies.clear()
 
         exceptions = []
         with self.app_context():
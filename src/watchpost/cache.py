@@ -24,12 +24,20 @@ includes a memoization decorator for function-level caching.
 
 from __future__ import annotations
 
+import asyncio
 import functools
 import hashlib
 import inspect
+import math
+import mmap
+import os
 import pickle
+import struct
+import threading
+import time
+import uuid
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Hashable
+from collections.abc import Callable, Hashable, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
@@ -37,6 +45,7 @@ from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 if TYPE_CHECKING:
     from redis import Redis
+    from redis.client import Pipeline
 
 T = TypeVar("T")
 
@@ -129,9 +138,11 @@ class CacheEntry[T]:
         Returns:
             True if the entry is expired; otherwise False.
         """
-        if not self.added_at:
+        if not self.added_at or self.ttl is None:
             return False
-        return self.ttl is not None and datetime.now(tz=UTC) - self.added_at > self.ttl
+        # Compare POSIX timestamps instead of doing datetime arithmetic, as this
+        # is called on every lookup.
+        return time.time() > self.added_at.timestamp() + self.ttl.total_seconds()
 
 
 class Storage(ABC):
@@ -173,6 +184,49 @@ class Storage(ABC):
                 The cache entry to store.
         """
 
+    def get_many(
+        self,
+        cache_keys: Sequence[CacheKey],
+        return_expired: bool = False,
+    ) -> list[CacheEntry | None]:
+        """
+        Retrieve several cache entries at once.
+
+        The default implementation calls `get` for every key. Backends that can
+        batch lookups, such as `RedisStorage`, override this.
+
+        Parameters:
+            cache_keys:
+                The cache keys to look up.
+            return_expired:
+                Whether to return expired entries once before they are removed.
+
+        Returns:
+            The cache entries in the order of `cache_keys`, with `None` for
+            every key that was not found.
+        """
+        return [
+            self.get(cache_key, return_expired=return_expired)
+            for cache_key in cache_keys
+        ]
+
+    def store_many(
+        self,
+        entries: Sequence[CacheEntry],
+    ) -> None:
+        """
+        Persist several cache entries at once.
+
+        The default implementation calls `store` for every entry. Backends that
+        can batch writes, such as `RedisStorage`, override this.
+
+        Parameters:
+            entries:
+                The cache entries to store.
+        """
+        for entry in entries:
+            self.store(entry)
+
 
 class ChainedStorage(Storage):
     """
@@ -234,6 +288,13 @@ class ChainedStorage(Storage):
         for storage in self.storages:
             storage.store(entry)
 
+    def store_many(
+        self,
+        entries: Sequence[CacheEntry],
+    ) -> None:
+        for storage in self.storages:
+            storage.store_many(entries)
+
 
 class InMemoryStorage(Storage):
     """
@@ -241,10 +302,31 @@ class InMemoryStorage(Storage):
 
     Useful for tests or ephemeral caching within a single process. Entries are
     lost when the process exits.
+
+    The storage is safe to share between the executor's worker threads. Reads
+    rely on the atomicity of single-key `dict` lookups and take no lock. Stores
+    and the removal of expired entries are serialized, so a reader removing an
+    expired entry cannot drop an entry another thread has just stored.
+
+    By default the storage grows without bound. When `max_entries` is set, the
+    least recently stored entries are evicted first once the limit is reached.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, max_entries: int | None = None) -> None:
+        """
+        Initialize the in-memory storage.
+
+        Parameters:
+            max_entries:
+                Optional upper bound on the number of entries kept. When
+                exceeded, the least recently stored entries are evicted.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+
         self.cache: dict[CacheKey, CacheEntry] = {}
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
 
     def get(
         self,
@@ -256,7 +338,7 @@ class InMemoryStorage(Storage):
             return None
 
         if cache_entry.is_expired():
-            del self.cache[cache_key]
+            self._remove_if_unchanged(cache_key, cache_entry)
             if return_expired:
                 return cache_entry
             return None
@@ -267,7 +349,30 @@ class InMemoryStorage(Storage):
         self,
         entry: CacheEntry,
     ) -> None:
-        self.cache[entry.cache_key] = entry
+        with self._lock:
+            if self.max_entries is None:
+                self.cache[entry.cache_key] = entry
+                return
+
+            # Re-insert so the dict's insertion order reflects the store order,
+            # making the first key the least recently stored one.
+            self.cache.pop(entry.cache_key, None)
+            self.cache[entry.cache_key] = entry
+            while len(self.cache) > self.max_entries:
+                del self.cache[next(iter(self.cache))]
+
+    def _remove_if_unchanged(
+        self,
+        cache_key: CacheKey,
+        cache_entry: CacheEntry,
+    ) -> None:
+        """
+        Remove `cache_entry` unless another thread has already removed or
+        replaced it.
+        """
+        with self._lock:
+            if self.cache.get(cache_key) is cache_entry:
+                del self.cache[cache_key]
 
 
 class DiskStorage(Storage):
@@ -275,8 +380,23 @@ class DiskStorage(Storage):
     A disk-backed storage backend using Pickle-serialized `CacheEntry` objects.
 
     Entries are stored under a versioned directory and sharded by a hash prefix.
+    Each file starts with a small fixed-size header holding the entry's
+    timestamp and TTL, so expired entries can be rejected without unpickling
+    their value.
     """
 
+    # Header layout: magic, `added_at` as POSIX timestamp and `ttl` in seconds,
+    # with NaN standing in for `None`. The pickled `CacheEntry` follows.
+    _HEADER = struct.Struct("<4sdd")
+    _HEADER_MAGIC = b"WPC1"
+    # Files with a header live in their own directory: code predating the
+    # header reads `v{CacheEntry.VERSION}` and expects a bare pickle there.
+    # Change this whenever the file layout changes.
+    _VERSION_DIRECTORY = f"v{CacheEntry.VERSION}-wpc1"
+    # Directory of the previous, header-less layout. `remove_expired` still
+    # sweeps expired entries from it so they do not linger on disk.
+    _LEGACY_VERSION_DIRECTORY = f"v{CacheEntry.VERSION}"
+
     def __init__(self, directory: str):
         """
         Initialize the disk storage.
@@ -293,7 +413,7 @@ class DiskStorage(Storage):
             str((cache_key.package, cache_key.key)).encode()
         ).hexdigest()
         prefix = key_hash[:2]
-        return self.directory / f"v{CacheEntry.VERSION}" / prefix / key_hash
+        return self.directory / self._VERSION_DIRECTORY / prefix / key_hash
 
     @staticmethod
     def _remove_empty_directories(file_path: Path) -> None:
@@ -303,39 +423,160 @@ class DiskStorage(Storage):
         except OSError:
             pass
 
-    def _remove_cache_entry_on_disk(self, cache_entry: CacheEntry) -> None:
-        file_path = self._get_file_path(cache_entry.cache_key)
-        file_path.unlink()
+    def _remove_file_on_disk(self, file_path: Path) -> None:
+        file_path.unlink(missing_ok=True)
         self._remove_empty_directories(file_path)
 
+    @classmethod
+    def _has_header(cls, mapped: mmap.mmap) -> bool:
+        return mapped[: len(cls._HEADER_MAGIC)] == cls._HEADER_MAGIC
+
+    @classmethod
+    def _is_expired_from_header(cls, mapped: mmap.mmap) -> bool:
+        """
+        Determine whether a cache file is expired from its header alone.
+
+        A file without a valid header was not written by this storage. It is
+        reported as expired so it gets removed; `_has_header` tells it apart
+        from an entry that actually expired.
+        """
+        if not cls._has_header(mapped):
+            return True
+
+        _, added_at, ttl = cls._HEADER.unpack_from(mapped)
+        return (
+            not math.isnan(added_at)
+            and not math.isnan(ttl)
+            and time.time() - added_at > ttl
+        )
+
+    @classmethod
+    def _read_cache_entry(
+        cls,
+        mapped: mmap.mmap,
+        return_expired: bool,
+    ) -> tuple[bool, CacheEntry | None]:
+        """
+        Read a cache entry from a memory-mapped cache file.
+
+        Parameters:
+            mapped:
+                The memory-mapped contents of the cache file.
+            return_expired:
+                Whether an expired entry should still be deserialized.
+
+        Returns:
+            Whether the entry is expired, and the entry itself. The entry is
+            `None` if it is expired and `return_expired` is false.
+        """
+        expired = cls._is_expired_from_header(mapped)
+        if expired and (not return_expired or not cls._has_header(mapped)):
+            return True, None
+
+        with memoryview(mapped) as view, view[cls._HEADER.size :] as payload:
+            return expired, pickle.loads(payload)
+
     def get(
         self,
         cache_key: CacheKey,
         return_expired: bool = False,
     ) -> CacheEntry[T] | None:
         file_path = self._get_file_path(cache_key)
-        if not file_path.exists():
+        try:
+            file = file_path.open("rb")
+        except FileNotFoundError:
             return None
 
-        with file_path.open("rb") as file:
-            cache_entry: CacheEntry[T] = pickle.load(file)
+        with (
+            file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            expired, cache_entry = self._read_cache_entry(mapped, return_expired)
 
-        if cache_entry.is_expired():
-            self._remove_cache_entry_on_disk(cache_entry)
-            if return_expired:
-                return cache_entry
-            return None
+        if expired:
+            self._remove_file_on_disk(file_path)
 
         return cache_entry
 
+    def remove_expired(self) -> int:
+        """
+        Remove all expired entries from disk.
+
+        `get` only removes an expired entry when it is looked up, so entries
+        that are never requested again stay on disk. Call this periodically to
+        reclaim their space. For the current layout, only the file headers are
+        read; values are never deserialized.
+
+        Files in the previous, header-less layout are no longer looked up but
+        may still be used by older versions sharing the directory. They have no
+        header, so they are unpickled and removed only if expired.
+
+        Returns:
+            The number of entries removed.
+        """
+        removed = self._remove_expired_legacy_entries()
+        for file_path in self.directory.glob(f"{self._VERSION_DIRECTORY}/*/*"):
+            if file_path.name.startswith(".tmp-"):
+                # Write in progress, see `store`.
+                continue
+
+            try:
+                file = file_path.open("rb")
+            except FileNotFoundError:
+                continue
+
+            with (
+                file,
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            ):
+                expired = self._is_expired_from_header(mapped)
+
+            if expired:
+                self._remove_file_on_disk(file_path)
+                removed += 1
+
+        return removed
+
+    def _remove_expired_legacy_entries(self) -> int:
+        removed = 0
+        for file_path in self.directory.glob(f"{self._LEGACY_VERSION_DIRECTORY}/*/*"):
+            try:
+                with file_path.open("rb") as file:
+                    cache_entry: CacheEntry = pickle.load(file)
+            except FileNotFoundError:
+                continue
+
+            if cache_entry.is_expired():
+                self._remove_file_on_disk(file_path)
+                removed += 1
+
+        return removed
+
     def store(
         self,
         entry: CacheEntry,
     ) -> None:
         file_path = self._get_file_path(entry.cache_key)
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with file_path.open("wb") as file:
-            pickle.dump(entry, file)
+        header = self._HEADER.pack(
+            self._HEADER_MAGIC,
+            entry.added_at.timestamp() if entry.added_at else math.nan,
+            entry.ttl.total_seconds() if entry.ttl is not None else math.nan,
+        )
+        # Write to a temporary file next to the target and rename it into
+        # place, so concurrent readers never observe a partially written file.
+        # The file is created with mode 0o666 (rather than through `mkstemp`,
+        # which uses 0o600) so that, like any other file, it follows the umask.
+        temp_path = file_path.parent / f".tmp-{uuid.uuid4().hex}"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(header)
+                pickle.dump(entry, file)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
 
 
 class RedisStorage(Storage):
@@ -369,6 +610,14 @@ class RedisStorage(Storage):
         self.redis = redis_client
         self._use_redis_ttl = use_redis_ttl
         self._redis_key_infix = redis_key_infix
+        # Deriving a Redis key hashes the cache key; memoize it per storage, as
+        # the same keys are requested over and over. The memo is keyed on the
+        # string that gets hashed rather than on the `CacheKey`: keys such as
+        # `1`, `1.0` and `True` compare equal but must map to distinct Redis
+        # keys.
+        self._cached_redis_key = functools.lru_cache(maxsize=4096)(
+            self._build_redis_key
+        )
 
     def _get_redis_key(self, cache_key: CacheKey) -> str:
         """
@@ -381,9 +630,10 @@ class RedisStorage(Storage):
         Returns:
             The namespaced Redis key.
         """
-        key_hash = hashlib.sha256(
-            str((cache_key.package, cache_key.key)).encode()
-        ).hexdigest()
+        return self._cached_redis_key(str((cache_key.package, cache_key.key)))
+
+    def _build_redis_key(self, cache_key_str: str) -> str:
+        key_hash = hashlib.sha256(cache_key_str.encode()).hexdigest()
 
         infix = ""
         if self._redis_key_infix:
@@ -419,13 +669,58 @@ class RedisStorage(Storage):
         cache_entry: CacheEntry[T] = pickle.loads(data)
 
         if cache_entry.is_expired():
-            self.redis.delete(redis_key)
+            self.redis.unlink(redis_key)
             if return_expired:
                 return cache_entry
             return None
 
         return cache_entry
 
+    def get_many(
+        self,
+        cache_keys: Sequence[CacheKey],
+        return_expired: bool = False,
+    ) -> list[CacheEntry | None]:
+        """
+        Retrieve several cache entries from Redis in a single round trip.
+
+        Expired entries are removed with one additional round trip.
+
+        Parameters:
+            cache_keys:
+                The keys to retrieve the values for.
+            return_expired:
+                Whether to return expired entries once before they are removed.
+
+        Returns:
+            The cache entries in the order of `cache_keys`, with `None` for
+            every key that was not found.
+        """
+        if not cache_keys:
+            return []
+
+        redis_keys = [self._get_redis_key(cache_key) for cache_key in cache_keys]
+        datas: list[Any] = self.redis.mget(redis_keys)
+
+        cache_entries: list[CacheEntry | None] = []
+        expired_redis_keys = []
+        for redis_key, data in zip(redis_keys, datas, strict=True):
+            if data is None:
+                cache_entries.append(None)
+                continue
+
+            cache_entry: CacheEntry = pickle.loads(data)
+            if cache_entry.is_expired():
+                expired_redis_keys.append(redis_key)
+                cache_entries.append(cache_entry if return_expired else None)
+            else:
+                cache_entries.append(cache_entry)
+
+        if expired_redis_keys:
+            self.redis.unlink(*expired_redis_keys)
+
+        return cache_entries
+
     def store(
         self,
         entry: CacheEntry,
@@ -437,19 +732,42 @@ class RedisStorage(Storage):
             entry:
                 The cache entry to store.
         """
+        self._queue_store(self.redis, entry)
+
+    def store_many(
+        self,
+        entries: Sequence[CacheEntry],
+    ) -> None:
+        """
+        Store several cache entries in Redis in a single round trip.
+
+        Parameters:
+            entries:
+                The cache entries to store.
+        """
+        pipeline = self.redis.pipeline(transaction=False)
+        for entry in entries:
+            self._queue_store(pipeline, entry)
+        pipeline.execute()
+
+    def _queue_store(self, client: Redis | Pipeline, entry: CacheEntry) -> None:
+        """
+        Issue the commands storing `entry` on `client`, which is either the
+        Redis client itself or a pipeline collecting the commands.
+        """
         redis_key = self._get_redis_key(entry.cache_key)
         data = pickle.dumps(entry)
 
         if self._use_redis_ttl and entry.ttl is not None and entry.added_at is not None:
             expiry_seconds = int(entry.ttl.total_seconds())
             if expiry_seconds > 0:
-                self.redis.setex(redis_key, expiry_seconds, data)
+                client.setex(redis_key, expiry_seconds, data)
             else:
                 # If the entry is already expired, ensure we don't hold a
                 # potentially old version in Redis anymore.
-                self.redis.delete(redis_key)
+                client.unlink(redis_key)
         else:
-            self.redis.set(redis_key, data)
+            client.set(redis_key, data)
 
 
 class Cache:
@@ -561,6 +879,158 @@ class Cache:
 
         return cache_entry
 
+    def get_many(
+        self,
+        keys: Sequence[Hashable],
+        *,
+        package: str | None = None,
+        return_expired: bool = False,
+    ) -> list[CacheEntry[T] | None]:
+        """
+        Retrieve several values from the cache at once.
+
+        Storage backends that support it, such as `RedisStorage`, look up all
+        keys in a single round trip.
+
+        Parameters:
+            keys:
+                The keys to look up. Each must be hashable and unique within
+                the given package.
+            package:
+                The package namespace. If not provided, the package of the
+                caller is used.
+            return_expired:
+                Whether to return expired entries once before they are removed.
+
+        Returns:
+            The cache entries in the order of `keys`, with `None` for every key
+            that was not found.
+        """
+        package = package or get_caller_package()
+        return self.storage.get_many(
+            [CacheKey(key=key, package=package) for key in keys],
+            return_expired=return_expired,
+        )
+
+    def store_many(
+        self,
+        items: Mapping[Hashable, T],
+        *,
+        package: str | None = None,
+        ttl: timedelta | None = None,
+    ) -> list[CacheEntry[T]]:
+        """
+        Store several values in the cache at once.
+
+        Storage backends that support it, such as `RedisStorage`, write all
+        entries in a single round trip.
+
+        Parameters:
+            items:
+                Mapping of keys to the values to store under them. Each key
+                must be hashable and unique within the given package.
+            package:
+                The package namespace. If not provided, the package of the
+                caller is used.
+            ttl:
+                Optional time-to-live applied to all entries. When omitted, the
+                entries do not expire.
+
+        Returns:
+            The cache entries that were stored.
+        """
+        package = package or get_caller_package()
+        added_at = datetime.now(tz=UTC)
+        cache_entries = [
+            CacheEntry(
+                cache_key=CacheKey(key=key, package=package),
+                value=value,
+                added_at=added_at,
+                ttl=ttl,
+            )
+            for key, value in items.items()
+        ]
+
+        self.storage.store_many(cache_entries)
+
+        return cache_entries
+
+    async def get_async(
+        self,
+        key: Hashable,
+        default: T | None = None,
+        *,
+        package: str | None = None,
+        return_expired: bool = False,
+    ) -> CacheEntry[T] | None:
+        """
+        Retrieve a value from the cache without blocking the event loop.
+
+        Behaves like `get`, but runs the storage lookup in a worker thread via
+        `asyncio.to_thread`. Use this from async checks when the storage
+        performs I/O, such as `DiskStorage` or `RedisStorage`.
+
+        Parameters:
+            key:
+                The key to look up. Must be hashable and unique within the given
+                package.
+            default:
+                An optional default value to return when the key is not found.
+            package:
+                The package namespace. If not provided, the package of the
+                caller is used.
+            return_expired:
+                Whether to return an expired entry once before it is removed.
+
+        Returns:
+            The cache entry if found, otherwise as described for `get`.
+        """
+        return await asyncio.to_thread(
+            self.get,
+            key,
+            default,
+            package=package or get_caller_package(),
+            return_expired=return_expired,
+        )
+
+    async def store_async(
+        self,
+        key: Hashable,
+        value: T,
+        *,
+        package: str | None = None,
+        ttl: timedelta | None = None,
+    ) -> CacheEntry[T]:
+        """
+        Store a value in the cache without blocking the event loop.
+
+        Behaves like `store`, but runs the storage write in a worker thread via
+        `asyncio.to_thread`.
+
+        Parameters:
+            key:
+                The key under which to store the value. Must be hashable and
+                unique within the given package.
+            value:
+                The value to store.
+            package:
+                The package namespace. If not provided, the package of the
+                caller is used.
+            ttl:
+                Optional time-to-live for the entry. When omitted, the entry
+                does not expire.
+
+        Returns:
+            The cache entry that was stored.
+        """
+        return await asyncio.to_thread(
+            self.store,
+            key,
+            value,
+            package=package or get_caller_package(),
+            ttl=ttl,
+        )
+
     def memoize[R, **P](
         self,
         *,
@@ -609,15 +1079,28 @@ class Cache:
         package = package or get_caller_package()
 
         def decorator(func: Callable[P, R]) -> Callable[P, R]:
+            if not key_generator and not (isinstance(key, str) and "{" in key):
+                return self._memoize_static_key(
+                    func,
+                    cache_key=CacheKey(key=key, package=package),
+                    return_expired=return_expired,
+                    ttl=ttl,
+                )
+
+            if key_generator:
+                make_key = key_generator
+            else:
+                # The key provided seems to be formattable. The signature is
+                # resolved once here rather than on every call.
+                key_format = cast(str, key).format
+                signature = inspect.signature(func)
+
+                def make_key(*args: P.args, **kwargs: P.kwargs) -> Hashable:
+                    return key_format(**signature.bind(*args, **kwargs).arguments)
+
             @functools.wraps(func)
             def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-                cache_key = key
-                if key_generator:
-                    cache_key = key_generator(*args, **kwargs)
-                elif isinstance(cache_key, str) and "{" in cache_key:
-                    # The key provided seems to be formattable.
-                    bound_arguments = inspect.signature(func).bind(*args, **kwargs)
-                    cache_key = cache_key.format(**bound_arguments.arguments)
+                cache_key = make_key(*args, **kwargs)
 
                 cache_entry: CacheEntry[R] | None = self.get(
                     key=cache_key,
@@ -639,3 +1122,42 @@ class Cache:
             return wrapper
 
         return decorator
+
+    def _memoize_static_key[R, **P](
+        self,
+        func: Callable[P, R],
+        *,
+        cache_key: CacheKey,
+        return_expired: bool,
+        ttl: timedelta | None,
+    ) -> Callable[P, R]:
+        """
+        Wrap `func` for `memoize` when the cache key does not depend on the
+        call arguments.
+
+        The `CacheKey` is built once when the decorator is applied and the
+        storage is queried directly, instead of going through `get` and `store`
+        on every call.
+        """
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            cache_entry: CacheEntry[R] | None = self.storage.get(
+                cache_key,
+                return_expired=return_expired,
+            )
+            if cache_entry:
+                return cache_entry.value
+
+            value = func(*args, **kwargs)
+            self.storage.store(
+                CacheEntry(
+                    cache_key=cache_key,
+                    value=value,
+                    added_at=datetime.now(tz=UTC),
+                    ttl=ttl,
+                )
+            )
+            return value
+
+        return wrapper
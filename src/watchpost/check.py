@@ -196,6 +196,14 @@ class Check:
 
         return self._check_function_signature  # type: ignore[attr-defined]
 
+    @property
+    def environments_frozenset(self) -> frozenset[Environment]:
+        """
+        Returns the cached `frozenset` of the environments this check targets.
+        """
+
+        return self._environments_frozenset  # type: ignore[attr-defined]
+
     @property
     def type_hints(self) -> dict[str, Any]:
         """
@@ -233,12 +241,26 @@ class Check:
         Initializes derived fields after dataclass construction.
 
         Caches the function signature to avoid repeated `inspect.signature`
-        calls.
+        calls, and the environments as a `frozenset` to avoid rebuilding a set
+        whenever scheduling strategies compare against them. Whether the check
+        function takes an `environment` argument is resolved once as well, as
+        it is needed on every run.
         """
+        signature = inspect.signature(self.check_function)
         object.__setattr__(
             self,
             "_check_function_signature",
-            inspect.signature(self.check_function),
+            signature,
+        )
+        object.__setattr__(
+            self,
+            "_takes_environment",
+            "environment" in signature.parameters,
+        )
+        object.__setattr__(
+            self,
+            "_environments_frozenset",
+            frozenset(self.environments),
         )
 
     def get_function_kwargs(
@@ -266,7 +288,7 @@ class Check:
             **datasources,
         }
 
-        if "environment" in self._check_function_signature.parameters:  # type: ignore[attr-defined]
+        if self._takes_environment:  # type: ignore[attr-defined]
             kwargs["environment"] = environment
 
         return kwargs
@@ -31,6 +31,7 @@ from __future__ import annotations
 
 from abc import ABC
 from collections.abc import Callable
+from functools import cached_property
 from types import EllipsisType
 from typing import Any, ClassVar, Protocol, overload
 
@@ -174,8 +175,17 @@ class FromFactory:
             A tuple that identifies the factory type and the provided arguments,
             suitable for use as a cache key.
         """
+        return (self.factory_type or type_key, *self._arguments_hash)
+
+    @cached_property
+    def _arguments_hash(self) -> tuple[int, int]:
+        """
+        Hashes of the positional and keyword arguments, as used in `cache_key`.
+
+        The arguments do not change after construction, so they are hashed
+        once on first use instead of on every datasource resolution.
+        """
         return (
-            self.factory_type or type_key,
             hash(frozenset(self.args)),
             hash(frozenset(self.kwargs.items())),
         )
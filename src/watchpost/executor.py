@@ -47,15 +47,30 @@ class AsyncioLoopThread(threading.Thread):
     The thread creates its own event loop and runs it forever until stopped.
     `CheckExecutor` uses this to execute coroutine functions without blocking
     the worker threads in the thread pool.
+
+    With `eager_tasks` enabled, the loop uses `asyncio.eager_task_factory`, so
+    submitted coroutines (and tasks they create) start running immediately
+    instead of waiting for the next loop iteration, and coroutines that never
+    suspend complete without being scheduled at all.
     """
 
-    def __init__(self, *args: Any, **kwargs: Any):
+    def __init__(
+        self,
+        *args: Any,
+        loop_factory: Callable[[], asyncio.AbstractEventLoop] | None = None,
+        eager_tasks: bool = False,
+        **kwargs: Any,
+    ):
         super().__init__(*args, **kwargs)
         self.loop: asyncio.AbstractEventLoop | None = None
         self.loop_started = threading.Event()
+        self._loop_factory = loop_factory or asyncio.new_event_loop
+        self._eager_tasks = eager_tasks
 
     def run(self) -> None:
-        self.loop = asyncio.new_event_loop()
+        self.loop = self._loop_factory()
+        if self._eager_tasks:
+            self.loop.set_task_factory(asyncio.eager_task_factory)
         asyncio.set_event_loop(self.loop)
 
         self.loop_started.set()
@@ -131,10 +146,33 @@ class CheckExecutor[T]:
     def __init__(
         self,
         max_workers: int | None = None,
+        *,
+        loop_factory: Callable[[], asyncio.AbstractEventLoop] | None = None,
+        eager_tasks: bool = False,
     ):
+        """
+        Initialize the executor.
+
+        Parameters:
+            max_workers:
+                Maximum number of worker threads for synchronous checks. Passed
+                through to the underlying `ThreadPoolExecutor`.
+            loop_factory:
+                Callable creating the event loop that coroutine functions run
+                on, for example `uvloop.new_event_loop`. Defaults to
+                `asyncio.new_event_loop`.
+            eager_tasks:
+                Whether to install `asyncio.eager_task_factory` on the event
+                loop. Coroutine functions then start executing immediately on
+                submission, and those that never suspend complete without being
+                scheduled on the loop. Tasks they create are eager as well,
+                which changes the order in which they run, so this is opt-in.
+        """
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self._state: dict[Hashable, _KeyState[T]] = {}
         self._asyncio_loop_thread: AsyncioLoopThread | None = None
+        self._loop_factory = loop_factory
+        self._eager_tasks = eager_tasks
 
     @property
     def asyncio_loop(self) -> asyncio.AbstractEventLoop:
@@ -146,7 +184,11 @@ class CheckExecutor[T]:
             executor.
         """
         if not self._asyncio_loop_thread:
-            self._asyncio_loop_thread = AsyncioLoopThread(daemon=True)
+            self._asyncio_loop_thread = AsyncioLoopThread(
+                daemon=True,
+                loop_factory=self._loop_factory,
+                eager_tasks=self._eager_tasks,
+            )
             self._asyncio_loop_thread.start()
             self._asyncio_loop_thread.loop_started.wait()
 
@@ -344,8 +386,13 @@ class BlockingCheckExecutor[T](CheckExecutor[T]):
     def __init__(
         self,
         max_workers: int | None = 1,
+        *,
+        loop_factory: Callable[[], asyncio.AbstractEventLoop] | None = None,
+        eager_tasks: bool = False,
     ):
-        super().__init__(max_workers)
+        super().__init__(
+            max_workers, loop_factory=loop_factory, eager_tasks=eager_tasks
+        )
 
     @override
     def result(
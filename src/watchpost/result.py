@@ -24,7 +24,7 @@ import base64
 import io
 import json
 import traceback
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Iterable
 from dataclasses import dataclass
 from enum import Enum
 from types import GeneratorType
@@ -681,10 +681,10 @@ def normalize_check_function_result(
     stdout: io.StringIO,
     stderr: io.StringIO,
 ) -> list[CheckResult]:
-    maybe_ongoing_check_results: list[CheckResult | OngoingCheckResult]
-    if isinstance(check_function_result, GeneratorType):
-        maybe_ongoing_check_results = list(check_function_result)
-    elif isinstance(check_function_result, list):
+    # Generators are consumed directly by the comprehension below, without
+    # first being materialized into an intermediate list.
+    maybe_ongoing_check_results: Iterable[CheckResult | OngoingCheckResult | None]
+    if isinstance(check_function_result, GeneratorType | list):
         maybe_ongoing_check_results = check_function_result
     else:
         maybe_ongoing_check_results = [
@@ -700,12 +700,12 @@ def normalize_check_function_result(
         if result is not None
     ]
 
-    stdfd_details = ""
+    stdfd_sections = []
     if stdout.tell() > 0:
-        stdfd_details += f"\n\n<STDOUT>\n{stdout.getvalue()}\n</STDOUT>"
+        stdfd_sections.append(f"<STDOUT>\n{stdout.getvalue()}\n</STDOUT>")
     if stderr.tell() > 0:
-        stdfd_details += f"\n\n<STDERR>\n{stderr.getvalue()}\n</STDERR>"
-    stdfd_details = stdfd_details.strip()
+        stdfd_sections.append(f"<STDERR>\n{stderr.getvalue()}\n</STDERR>")
+    stdfd_details = "\n\n".join(stdfd_sections)
 
     if stdfd_details:
         for check_result in check_results:
@@ -67,8 +67,7 @@ applies them to each check to derive the final scheduling decision.
 from __future__ import annotations
 
 from enum import IntEnum
-from functools import reduce
-from typing import TYPE_CHECKING, Protocol, TypeVar, override
+from typing import TYPE_CHECKING, Final, Protocol, override
 
 if TYPE_CHECKING:
     from .check import Check
@@ -151,6 +150,12 @@ class SchedulingDecision(IntEnum):
     """
 
 
+# Module-level aliases of the decisions for use in hot paths: looking up an enum
+# member through its class is considerably slower than reading a global.
+_SCHEDULE: Final = SchedulingDecision.SCHEDULE
+_DONT_SCHEDULE: Final = SchedulingDecision.DONT_SCHEDULE
+
+
 class SchedulingStrategy(Protocol):
     """
     Protocol for pluggable scheduling logic.
@@ -225,8 +230,8 @@ class MustRunInGivenExecutionEnvironmentStrategy(SchedulingStrategy):
         target_environment: Environment,
     ) -> SchedulingDecision:
         if current_execution_environment in self.supported_execution_environments:
-            return SchedulingDecision.SCHEDULE
-        return SchedulingDecision.DONT_SCHEDULE
+            return _SCHEDULE
+        return _DONT_SCHEDULE
 
 
 class MustRunInTargetEnvironmentStrategy(SchedulingStrategy):
@@ -247,8 +252,8 @@ class MustRunInTargetEnvironmentStrategy(SchedulingStrategy):
         target_environment: Environment,
     ) -> SchedulingDecision:
         if current_execution_environment == target_environment:
-            return SchedulingDecision.SCHEDULE
-        return SchedulingDecision.DONT_SCHEDULE
+            return _SCHEDULE
+        return _DONT_SCHEDULE
 
 
 class MustRunAgainstGivenTargetEnvironmentStrategy(SchedulingStrategy):
@@ -278,11 +283,8 @@ class MustRunAgainstGivenTargetEnvironmentStrategy(SchedulingStrategy):
         target_environment: Environment,
     ) -> SchedulingDecision:
         if target_environment in self.supported_target_environments:
-            return SchedulingDecision.SCHEDULE
-        return SchedulingDecision.DONT_SCHEDULE
-
-
-_S = TypeVar("_S", bound=SchedulingStrategy)
+            return _SCHEDULE
+        return _DONT_SCHEDULE
 
 
 class DetectImpossibleCombinationStrategy(SchedulingStrategy):
@@ -301,16 +303,66 @@ class DetectImpossibleCombinationStrategy(SchedulingStrategy):
       in the `@check` decorator.
     - A "current == target" requirement while the allowed execution and target
       sets do not overlap, so the check can never run.
+
+    The outcome only depends on the strategies the current application resolved
+    for the check, not on the execution or target environment. Every check is
+    therefore validated once per resolved list of strategies, and the outcome is
+    reused for subsequent scheduling calls. A different application, or one
+    that resolved the strategies anew, gets a fresh validation.
     """
 
+    def __init__(self) -> None:
+        # Maps each check to the strategies it was validated against, and the
+        # reason it is invalid (or `None` if it is valid). The strategies are
+        # kept so an identity check can tell whether they are still current.
+        self._validated_checks: dict[
+            Check, tuple[list[SchedulingStrategy], str | None]
+        ] = {}
+
     @staticmethod
-    def _filter_strategies(
+    def _partition_strategies(
         strategies: list[SchedulingStrategy],
-        strategy_type: type[_S],
-    ) -> list[_S]:
-        return [
-            strategy for strategy in strategies if isinstance(strategy, strategy_type)
-        ]
+    ) -> tuple[
+        list[MustRunInGivenExecutionEnvironmentStrategy],
+        list[MustRunAgainstGivenTargetEnvironmentStrategy],
+        bool,
+    ]:
+        """
+        Split the strategies relevant for validation out of the given list in a
+        single pass.
+
+        Returns:
+            The `MustRunInGivenExecutionEnvironmentStrategy` instances, the
+            `MustRunAgainstGivenTargetEnvironmentStrategy` instances, and
+            whether any `MustRunInTargetEnvironmentStrategy` is present.
+        """
+        execution_environment_strategies = []
+        target_environment_strategies = []
+        must_run_in_target_environment = False
+        for strategy in strategies:
+            if isinstance(strategy, MustRunInGivenExecutionEnvironmentStrategy):
+                execution_environment_strategies.append(strategy)
+            elif isinstance(strategy, MustRunAgainstGivenTargetEnvironmentStrategy):
+                target_environment_strategies.append(strategy)
+            elif isinstance(strategy, MustRunInTargetEnvironmentStrategy):
+                must_run_in_target_environment = True
+
+        return (
+            execution_environment_strategies,
+            target_environment_strategies,
+            must_run_in_target_environment,
+        )
+
+    @staticmethod
+    def _intersect(environment_sets: list[set[Environment]]) -> set[Environment]:
+        """
+        Intersect all given sets of environments in a single call.
+
+        The smallest set is used as the base of the intersection, so only its
+        members have to be probed against the other sets.
+        """
+        environment_sets.sort(key=len)
+        return environment_sets[0].intersection(*environment_sets[1:])
 
     @override
     def schedule(
@@ -320,21 +372,53 @@ class DetectImpossibleCombinationStrategy(SchedulingStrategy):
         target_environment: Environment,
     ) -> SchedulingDecision:
         strategies = current_app._resolve_scheduling_strategies(check)
+        validated = self._validated_checks.get(check)
+        if validated is None or validated[0] is not strategies:
+            try:
+                self.validate(check)
+            except InvalidCheckConfiguration as e:
+                self._validated_checks[check] = (strategies, e.reason)
+                raise
+            self._validated_checks[check] = (strategies, None)
+            return _SCHEDULE
+
+        reason = validated[1]
+        if reason is not None:
+            # Raise a new exception every time, callers may still hold on to
+            # earlier ones.
+            raise InvalidCheckConfiguration(check, reason)
+        return _SCHEDULE
+
+    def validate(self, check: Check) -> None:
+        """
+        Validate the combination of scheduling strategies that apply to the
+        given check.
 
-        must_run_in_given_execution_environment_strategies = self._filter_strategies(
-            strategies,
-            MustRunInGivenExecutionEnvironmentStrategy,
-        )
-        must_run_against_given_target_environment_strategies = self._filter_strategies(
-            strategies,
-            MustRunAgainstGivenTargetEnvironmentStrategy,
-        )
-        must_run_in_current_execution_environment = bool(
-            self._filter_strategies(
-                strategies,
-                MustRunInTargetEnvironmentStrategy,
-            )
-        )
+        Parameters:
+            check:
+                The check whose resolved scheduling strategies are validated.
+
+        Raises:
+            InvalidCheckConfiguration:
+                The strategies of the check are mutually incompatible, so the
+                check can never be scheduled.
+        """
+        strategies = current_app._resolve_scheduling_strategies(check)
+
+        (
+            must_run_in_given_execution_environment_strategies,
+            must_run_against_given_target_environment_strategies,
+            must_run_in_current_execution_environment,
+        ) = self._partition_strategies(strategies)
+
+        # Without any environment constraints there is nothing that could
+        # conflict, which is the common case for most checks.
+        if (
+            not must_run_in_given_execution_environment_strategies
+            and not must_run_against_given_target_environment_strategies
+            and not must_run_in_current_execution_environment
+        ):
+            return
 
         # Verify that execution-environment constraints across all strategies are compatible.
         #
@@ -344,12 +428,11 @@ class DetectImpossibleCombinationStrategy(SchedulingStrategy):
         # Example: DS A requires Monitoring, DS B requires Preprod -> impossible.
         overlapping_execution_environments: set[Environment] | None = None
         if must_run_in_given_execution_environment_strategies:
-            overlapping_execution_environments = reduce(
-                set.intersection,
-                (
+            overlapping_execution_environments = self._intersect(
+                [
                     strategy.supported_execution_environments
                     for strategy in must_run_in_given_execution_environment_strategies
-                ),
+                ]
             )
             if not overlapping_execution_environments:
                 raise InvalidCheckConfiguration(
@@ -366,14 +449,13 @@ class DetectImpossibleCombinationStrategy(SchedulingStrategy):
         # Example: Check targets [Monitoring, Preprod] but one datasource only allows [Preprod].
         overlapping_target_environments: set[Environment] | None = None
         if must_run_against_given_target_environment_strategies:
-            overlapping_target_environments = reduce(
-                set.intersection,
-                (
+            overlapping_target_environments = self._intersect(
+                [
                     strategy.supported_target_environments
                     for strategy in must_run_against_given_target_environment_strategies
-                ),
+                ]
             )
-            if not overlapping_target_environments.issuperset(set(check.environments)):
+            if not overlapping_target_environments >= check.environments_frozenset:
                 raise InvalidCheckConfiguration(
                     check,
                     "Target-environment constraints conflict with the check's declared environments: the @check(..., environments=[...]) set must be a subset of the intersection across MustRunAgainstGivenTargetEnvironment strategies.",
@@ -393,5 +475,3 @@ class DetectImpossibleCombinationStrategy(SchedulingStrategy):
                         check,
                         "Current=Target requirement cannot be satisfied: allowed execution environments and allowed target environments have no overlap (e.g., execution must be 'Monitoring' while target must be 'Preprod').",
                     )
-
-        return SchedulingDecision.SCHEDULE
@@ -23,18 +23,18 @@ from dataclasses import dataclass
 from datetime import timedelta
 from pathlib import Path
 
-from timelength import TimeLength  # type: ignore
-
 import watchpost
 
 
-@dataclass
+@dataclass(frozen=True)
 class InvocationInformation:
     """
     Call-site information for an invocation.
 
     Holds the relative path of the module and the line number where the
-    invocation occurred.
+    invocation occurred. Instances are immutable, since the ones returned by
+    `get_invocation_information` are shared between all invocations from the
+    same call-site.
     """
 
     relative_path: str
@@ -49,6 +49,31 @@ class InvocationInformation:
         )
 
 
+_invocation_information_cache: dict[tuple[str, int], InvocationInformation] = {}
+
+
+def _intern_invocation_information(
+    relative_path: str,
+    line_number: int,
+) -> InvocationInformation:
+    """
+    Return the shared `InvocationInformation` for the given call-site.
+
+    Repeated invocations from the same file and line reuse a single instance,
+    so comparisons and hash lookups downstream can short-circuit on identity.
+    """
+    key = (relative_path, line_number)
+    if (invocation_information := _invocation_information_cache.get(key)) is None:
+        invocation_information = _invocation_information_cache.setdefault(
+            key,
+            InvocationInformation(
+                relative_path=relative_path,
+                line_number=line_number,
+            ),
+        )
+    return invocation_information
+
+
 def get_invocation_information() -> InvocationInformation | None:
     """
     Return call-site information for the caller's caller.
@@ -90,9 +115,9 @@ def get_invocation_information() -> InvocationInformation | None:
     except ValueError:
         return None
 
-    return InvocationInformation(
-        relative_path=str(relative_path),
-        line_number=relevant_frame.f_lineno,
+    return _intern_invocation_information(
+        str(relative_path),
+        relevant_frame.f_lineno,
     )
 
 
@@ -118,4 +143,8 @@ def normalize_to_timedelta(value: timedelta | str | None) -> timedelta | None:
     if isinstance(value, timedelta):
         return value
 
+    # Importing timelength is comparatively expensive, so we only do it once a
+    # string actually has to be parsed.
+    from timelength import TimeLength  # type: ignore
+
     return timedelta(seconds=TimeLength(value).result.seconds)
@@ -0,0 +1,127 @@
+# Copyright 2025 TAKKT Industrial & Packaging GmbH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import sys
+from collections.abc import Callable
+from typing import Any
+
+import docker
+import pytest
+import redis
+from docker.errors import DockerException
+from testcontainers.redis import RedisContainer
+
+from watchpost.app import Watchpost
+from watchpost.check import Check
+from watchpost.environment import Environment
+from watchpost.executor import BlockingCheckExecutor
+
+
+@pytest.fixture(scope="session")
+def base_env() -> Environment:
+    """
+    Provide the environment the test applications execute in.
+    """
+    return Environment("test-env")
+
+
+@pytest.fixture(scope="session")
+def empty_app(base_env: Environment) -> Watchpost:
+    """
+    Provide a Watchpost application without any checks.
+
+    The application is shared across the whole test session, so tests using
+    this fixture must not modify it. Use `make_app` for tests that register
+    datasources or run checks.
+    """
+    return Watchpost(
+        checks=[],
+        execution_environment=base_env,
+        executor=BlockingCheckExecutor(),
+    )
+
+
+@pytest.fixture()
+def make_app(base_env: Environment) -> Callable[..., Watchpost]:
+    """
+    Provide a factory that creates a fresh Watchpost application per call.
+
+    The factory defaults to a `BlockingCheckExecutor` and the `base_env`
+    execution environment. All keyword arguments are forwarded to `Watchpost`.
+    """
+
+    def factory(checks: list[Check], **kwargs: Any) -> Watchpost:
+        kwargs.setdefault("execution_environment", base_env)
+        kwargs.setdefault("executor", BlockingCheckExecutor())
+        return Watchpost(checks=list(checks), **kwargs)
+
+    return factory
+
+
+@pytest.fixture()
+def stdout_sink(monkeypatch: pytest.MonkeyPatch) -> io.BytesIO:
+    """
+    Capture everything written to `sys.stdout.buffer` in a `BytesIO`.
+
+    `sys.stdout.buffer.write` is redirected to the returned buffer, so
+    `stdout_sink.getvalue()` yields the raw bytes written by
+    `Watchpost.run_checks_once`.
+    """
+    sink = io.BytesIO()
+    monkeypatch.setattr(sys.stdout.buffer, "write", sink.write)
+    return sink
+
+
+@pytest.fixture(scope="session")
+def redis_container():
+    """
+    Fixture that provides a Redis container for testing.
+
+    This fixture is scoped to the session, so a single container is started
+    for all tests that need Redis. Tests sharing it are responsible for
+    cleaning up the keys they create.
+
+    When no Docker daemon is reachable, the dependent tests are skipped right
+    away instead of waiting for testcontainers to give up.
+    """
+    try:
+        docker.from_env(timeout=1).ping()
+    except (DockerException, OSError) as e:
+        pytest.skip(f"Docker is unavailable: {e}")
+
+    with RedisContainer() as container:
+        yield container
+
+
+@pytest.fixture(scope="session")
+def redis_client(redis_container):
+    """
+    Fixture that provides a Redis client connected to the Redis container.
+
+    This fixture depends on the redis_container fixture. The connection is
+    established once up front and kept alive for the rest of the session.
+    """
+    client = redis.Redis(
+        host=redis_container.get_container_host_ip(),
+        port=redis_container.get_exposed_port(6379),
+        decode_responses=False,
+        socket_keepalive=True,
+        health_check_interval=30,
+    )
+    client.ping()
+    yield client
+    client.close()
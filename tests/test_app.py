@@ -14,9 +14,12 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import re
+import time
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
-from typing import override
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from typing import Any, override
 
 import pytest
 
@@ -28,214 +31,221 @@ from watchpost.environment import Environment
 from watchpost.executor import BlockingCheckExecutor
 from watchpost.globals import current_app
 from watchpost.result import CheckState, ExecutionResult, ok
-from watchpost.scheduling_strategy import InvalidCheckConfiguration
+from watchpost.scheduling_strategy import (
+    InvalidCheckConfiguration,
+    SchedulingDecision,
+    SchedulingStrategy,
+)
 
-from .utils import decode_checkmk_output
+from .utils import StubCheck, decode_checkmk_output
 
 TEST_ENVIRONMENT = Environment("test-env")
+_NOT_AVAILABLE_RE = re.compile("Watchpost application is not available")
+
+
+def _make_execution_result(
+    piggyback_host: str,
+    service_name: str,
+    check_state: CheckState = CheckState.OK,
+    summary: str = "Test summary",
+) -> ExecutionResult:
+    return ExecutionResult(
+        piggyback_host=piggyback_host,
+        service_name=service_name,
+        service_labels={"env": "test"},
+        environment_name="test-env",
+        check_state=check_state,
+        summary=summary,
+    )
+
+
+# Results returned by the stub checks. They are shared between tests and must
+# not be modified.
+_OK_RESULT = _make_execution_result("test-host", "test-service")
+_OK_RESULT_1 = _make_execution_result(
+    "test-host-1",
+    "test-service-1",
+    summary="Test summary 1",
+)
+_WARN_RESULT_2 = _make_execution_result(
+    "test-host-2",
+    "test-service-2",
+    CheckState.WARN,
+    "Test summary 2",
+)
 
 
 class TestDatasource(Datasource):
     pass
 
 
-def test_watchpost_initialization():
+class _AlwaysSkipStrategy(SchedulingStrategy):
+    @override
+    def schedule(self, check, current_execution_environment, target_environment):
+        return SchedulingDecision.SKIP
+
+
+class _AlwaysDontScheduleStrategy(SchedulingStrategy):
+    @override
+    def schedule(self, check, current_execution_environment, target_environment):
+        return SchedulingDecision.DONT_SCHEDULE
+
+
+# The strategies are stateless, so the same instances can be shared by all tests.
+_ALWAYS_SKIP = _AlwaysSkipStrategy()
+_ALWAYS_DONT_SCHEDULE = _AlwaysDontScheduleStrategy()
+
+
+@pytest.fixture()
+def make_app_with_ds(make_app) -> Callable[..., Watchpost]:
+    """
+    Provide a factory for fresh Watchpost applications with `TestDatasource`
+    registered.
+
+    Each test gets its own application, so scheduling verification, the check
+    cache and resolved datasources never carry over between tests.
+    """
+
+    def factory(checks: list[Check], **kwargs: Any) -> Watchpost:
+        app = make_app(checks, **kwargs)
+        app.register_datasource(TestDatasource)
+        return app
+
+    return factory
+
+
+def test_watchpost_initialization(make_app):
     """Test that an Watchpost object can be properly initialized."""
-    # Create a mock check
-    mock_check = MagicMock(spec=Check)
+    # Create a stub check
+    stub_check = StubCheck()
 
-    # Initialize the Watchpost object
-    app = Watchpost(
-        checks=[mock_check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
+    app = make_app([stub_check])
 
     # Verify the Watchpost object was initialized correctly
-    assert app.checks == [mock_check]
+    assert app.checks == [stub_check]
 
 
-def test_app_context():
+def test_app_context(empty_app):
     """Test that the app_context method properly sets and resets the context variable."""
-    # Create an Watchpost instance
-    app = Watchpost(
-        checks=[],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
-
     # Before entering the context, current_app should raise an error
-    with pytest.raises(RuntimeError, match="Watchpost application is not available"):
+    with pytest.raises(RuntimeError, match=_NOT_AVAILABLE_RE):
         _ = current_app.__name__  # type: ignore[unresolved-attribute]
 
     # Within the context, current_app should be the app instance
-    with app.app_context():
-        assert current_app._get_current_object() is app  # type: ignore[unresolved-attribute]
+    with empty_app.app_context():
+        assert current_app._get_current_object() is empty_app  # type: ignore[unresolved-attribute]
 
     # After exiting the context, current_app should raise an error again
-    with pytest.raises(RuntimeError, match="Watchpost application is not available"):
+    with pytest.raises(RuntimeError, match=_NOT_AVAILABLE_RE):
         _ = current_app.__name__  # type: ignore[unresolved-attribute]
 
 
-def test_app_context_exception_handling():
+def test_app_context_exception_handling(empty_app):
     """Test that the app_context method properly handles exceptions."""
-    # Create an Watchpost instance
-    app = Watchpost(
-        checks=[],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
-
     # Test that the context is properly reset even if an exception occurs
     try:
-        with app.app_context():
-            assert current_app._get_current_object() is app  # type: ignore[unresolved-attribute]
+        with empty_app.app_context():
+            assert current_app._get_current_object() is empty_app  # type: ignore[unresolved-attribute]
             raise ValueError("Test exception")
     except ValueError:
         pass
 
     # After the exception, current_app should raise an error
-    with pytest.raises(RuntimeError, match="Watchpost application is not available"):
+    with pytest.raises(RuntimeError, match=_NOT_AVAILABLE_RE):
         _ = current_app.__name__  # type: ignore[unresolved-attribute]
 
 
-def test_run_checks_once():
+def test_run_checks_once(make_app, stdout_sink):
     """Test that the run_checks_once method runs all checks and outputs the results."""
-    # Create a mock check that returns a known ExecutionResult
-    mock_check = MagicMock(spec=Check)
-    mock_check.name = "Test Check"
-    mock_check.service_name = "Test Check"
-    mock_check.service_labels = {}
-    mock_check.environments = [TEST_ENVIRONMENT]
-    mock_check.cache_for = None
-    mock_check.is_async = False
-    execution_result = ExecutionResult(
-        piggyback_host="test-host",
-        service_name="test-service",
-        service_labels={"env": "test"},
-        environment_name="test-env",
-        check_state=CheckState.OK,
-        summary="Test summary",
-    )
-    mock_check.run_sync.return_value = [execution_result]
-
-    # Initialize the Watchpost object
-    app = Watchpost(
-        checks=[mock_check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
+    # Create a stub check that returns a known ExecutionResult
+    stub_check = StubCheck(
+        name="Test Check",
+        service_name="Test Check",
+        environments=[TEST_ENVIRONMENT],
+        result=[_OK_RESULT],
     )
 
-    # Mock sys.stdout.buffer.write to capture the output
-    with patch("sys.stdout.buffer.write") as mock_write:
-        # Run the checks
-        app.run_checks_once()
+    app = make_app([stub_check])
 
-        # Verify that the check was run
-        mock_check.run_sync.assert_called_once()
+    # Run the checks
+    app.run_checks_once()
 
-        # Verify that sys.stdout.buffer.write was called with the expected data
-        assert mock_write.call_count > 0
+    # Verify that the check was run
+    assert stub_check.run_sync_calls == 1
 
-        # Collect all the data written to stdout
-        all_data = b"".join(call_args[0][0] for call_args in mock_write.call_args_list)
+    # Verify that data was written to stdout
+    assert stdout_sink.tell() > 0
 
-        # Decode the base64 data using the utility function
-        json_data = decode_checkmk_output(all_data)[0]
+    # Collect and decode all the data written to stdout
+    json_data = decode_checkmk_output(stdout_sink.getvalue())[0]
 
-        # Verify the decoded data contains the expected values
-        assert json_data["service_name"] == "test-service"
-        assert json_data["environment"] == "test-env"
-        assert json_data["check_state"] == "OK"
-        assert json_data["summary"] == "Test summary"
+    # Verify the decoded data contains the expected values
+    assert json_data["service_name"] == "test-service"
+    assert json_data["environment"] == "test-env"
+    assert json_data["check_state"] == "OK"
+    assert json_data["summary"] == "Test summary"
 
 
-def test_run_checks_once_with_multiple_checks():
+def test_run_checks_once_with_multiple_checks(make_app, stdout_sink):
     """Test that the run_checks_once method runs multiple checks."""
-    # Create two mock checks
-    mock_check1 = MagicMock(spec=Check)
-    mock_check1.name = "Test Check 1"
-    mock_check1.service_name = "Test Check 1"
-    mock_check1.service_labels = {}
-    mock_check1.environments = [TEST_ENVIRONMENT]
-    mock_check1.cache_for = None
-    mock_check1.is_async = False
-    execution_result1 = ExecutionResult(
-        piggyback_host="test-host-1",
-        service_name="test-service-1",
-        service_labels={"env": "test"},
-        environment_name="test-env",
-        check_state=CheckState.OK,
-        summary="Test summary 1",
-    )
-    mock_check1.run_sync.return_value = [execution_result1]
-
-    mock_check2 = MagicMock(spec=Check)
-    mock_check2.name = "Test Check 2"
-    mock_check2.service_name = "Test Check 2"
-    mock_check2.service_labels = {}
-    mock_check2.environments = [TEST_ENVIRONMENT]
-    mock_check2.cache_for = None
-    mock_check2.is_async = False
-    execution_result2 = ExecutionResult(
-        piggyback_host="test-host-2",
-        service_name="test-service-2",
-        service_labels={"env": "test"},
-        environment_name="test-env",
-        check_state=CheckState.WARN,
-        summary="Test summary 2",
+    # Create two stub checks
+    stub_check1 = StubCheck(
+        name="Test Check 1",
+        service_name="Test Check 1",
+        environments=[TEST_ENVIRONMENT],
+        result=[_OK_RESULT_1],
     )
-    mock_check2.run_sync.return_value = [execution_result2]
 
-    # Initialize the Watchpost object with both checks
-    app = Watchpost(
-        checks=[mock_check1, mock_check2],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
+    stub_check2 = StubCheck(
+        name="Test Check 2",
+        service_name="Test Check 2",
+        environments=[TEST_ENVIRONMENT],
+        result=[_WARN_RESULT_2],
     )
 
-    # Mock sys.stdout.buffer.write to capture the output
-    with patch("sys.stdout.buffer.write") as mock_write:
-        # Run the checks
-        app.run_checks_once()
+    app = make_app([stub_check1, stub_check2])
 
-        # Verify that both checks were run
-        mock_check1.run_sync.assert_called_once()
-        mock_check2.run_sync.assert_called_once()
+    # Run the checks
+    app.run_checks_once()
 
-        # Collect all the data written to stdout
-        all_data = b"".join(call_args[0][0] for call_args in mock_write.call_args_list)
+    # Verify that both checks were run
+    assert stub_check1.run_sync_calls == 1
+    assert stub_check2.run_sync_calls == 1
 
-        # Verify the basic structure
-        assert b"test-host-1" in all_data
-        assert b"test-host-2" in all_data
+    # Collect all the data written to stdout
+    all_data = stdout_sink.getvalue()
 
-        # Decode the base64 data using the utility function
-        json_data_list = decode_checkmk_output(all_data)
+    # Verify the basic structure
+    assert b"test-host-1" in all_data
+    assert b"test-host-2" in all_data
 
-        # Verify we found three results (our two and the one default watchpost check)
-        assert len(json_data_list) == 3
+    # Decode the base64 data using the utility function
+    json_data_list = decode_checkmk_output(all_data)
 
-        # Verify the first result
-        assert any(
-            data["service_name"] == "test-service-1"
-            and data["environment"] == "test-env"
-            and data["check_state"] == "OK"
-            and data["summary"] == "Test summary 1"
-            for data in json_data_list
-        )
+    # Verify we found three results (our two and the one default watchpost check)
+    assert len(json_data_list) == 3
 
-        # Verify the second result
-        assert any(
-            data["service_name"] == "test-service-2"
-            and data["environment"] == "test-env"
-            and data["check_state"] == "WARN"
-            and data["summary"] == "Test summary 2"
-            for data in json_data_list
-        )
+    # Index the results by service name to look them up directly
+    by_name = {data["service_name"]: data for data in json_data_list}
+
+    # Verify the first result
+    result1 = by_name["test-service-1"]
+    assert (result1["environment"], result1["check_state"], result1["summary"]) == (
+        "test-env",
+        "OK",
+        "Test summary 1",
+    )
+
+    # Verify the second result
+    result2 = by_name["test-service-2"]
+    assert (result2["environment"], result2["check_state"], result2["summary"]) == (
+        "test-env",
+        "WARN",
+        "Test summary 2",
+    )
 
 
-def test_run_checks_once_with_real_check():
+def test_run_checks_once_with_real_check(make_app_with_ds, stdout_sink):
     """Test that the run_checks_once method works with a real Check object."""
 
     # Create a simple check function
@@ -252,37 +262,29 @@ def test_run_checks_once_with_real_check():
         cache_for=None,
     )
 
-    # Initialize the Watchpost object
-    app = Watchpost(
-        checks=[check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
-    app.register_datasource(TestDatasource)
+    app = make_app_with_ds([check])
 
-    # Mock sys.stdout.buffer.write to capture the output
-    with patch("sys.stdout.buffer.write") as mock_write:
-        # Run the checks
-        app.run_checks_once()
+    # Run the checks
+    app.run_checks_once()
 
-        # Collect all the data written to stdout
-        all_data = b"".join(call_args[0][0] for call_args in mock_write.call_args_list)
+    # Collect all the data written to stdout
+    all_data = stdout_sink.getvalue()
 
-        # Verify the basic structure
-        expected_host = "test-service-test-env"
-        assert expected_host.encode() in all_data
+    # Verify the basic structure
+    expected_host = "test-service-test-env"
+    assert expected_host.encode() in all_data
 
-        # Decode the base64 data using the utility function
-        json_data = decode_checkmk_output(all_data)[0]
+    # Decode the base64 data using the utility function
+    json_data = decode_checkmk_output(all_data)[0]
 
-        # Verify the decoded data contains the expected values
-        assert json_data["service_name"] == "test-service"
-        assert json_data["environment"] == "test-env"
-        assert json_data["check_state"] == "OK"
-        assert json_data["summary"] == "Test passed"
+    # Verify the decoded data contains the expected values
+    assert json_data["service_name"] == "test-service"
+    assert json_data["environment"] == "test-env"
+    assert json_data["check_state"] == "OK"
+    assert json_data["summary"] == "Test passed"
 
 
-def test_ensure_current_app_is_set_in_check():
+def test_ensure_current_app_is_set_in_check(make_app_with_ds):
     @check(
         name="Current app is set in check",
         service_labels={"test": "true"},
@@ -291,17 +293,9 @@ def test_ensure_current_app_is_set_in_check():
     )
     def check_func(test_datasource: TestDatasource):
         _ = test_datasource
-
-        from watchpost.globals import current_app
-
         return ok(repr(current_app))
 
-    app = Watchpost(
-        checks=[check_func],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
-    app.register_datasource(TestDatasource)
+    app = make_app_with_ds([check_func])
 
     with app.app_context():
         raw_output = b"".join(app.run_checks())
@@ -334,14 +328,7 @@ def test_ensure_current_app_is_set_in_check():
     )
 
 
-def test_run_checks_skip_without_prior_results_returns_unknown():
-    from watchpost.scheduling_strategy import SchedulingDecision, SchedulingStrategy
-
-    class AlwaysSkipStrategy(SchedulingStrategy):
-        @override
-        def schedule(self, check, current_execution_environment, target_environment):
-            return SchedulingDecision.SKIP
-
+def test_run_checks_skip_without_prior_results_returns_unknown(make_app, stdout_sink):
     @check(
         name="Skip without prior",
         service_labels={"test": "true"},
@@ -351,33 +338,19 @@ def test_run_checks_skip_without_prior_results_returns_unknown():
     def my_check():
         raise AssertionError("Should not be executed when SKIP without prior results")
 
-    app = Watchpost(
-        checks=[my_check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-        default_scheduling_strategies=[AlwaysSkipStrategy()],
-    )
-
-    with patch("sys.stdout.buffer.write") as mock_write:
-        app.run_checks_once()
-        all_data = b"".join(call_args[0][0] for call_args in mock_write.call_args_list)
-        results = decode_checkmk_output(all_data)
-        result = next(r for r in results if r["service_name"] == "Skip without prior")
-        assert result["check_state"] == "UNKNOWN"
-        assert (
-            result["summary"]
-            == "Check is temporarily unschedulable and no prior results are available"
-        )
-
+    app = make_app([my_check], default_scheduling_strategies=[_ALWAYS_SKIP])
 
-def test_run_checks_skip_with_prior_results_reuses_cache():
-    from watchpost.scheduling_strategy import SchedulingDecision, SchedulingStrategy
+    app.run_checks_once()
+    results = decode_checkmk_output(stdout_sink.getvalue())
+    result = next(r for r in results if r["service_name"] == "Skip without prior")
+    assert result["check_state"] == "UNKNOWN"
+    assert (
+        result["summary"]
+        == "Check is temporarily unschedulable and no prior results are available"
+    )
 
-    class AlwaysSkipStrategy(SchedulingStrategy):
-        @override
-        def schedule(self, check, current_execution_environment, target_environment):
-            return SchedulingDecision.SKIP
 
+def test_run_checks_skip_with_prior_results_reuses_cache(make_app, stdout_sink):
     @check(
         name="Skip with prior",
         service_labels={"test": "true"},
@@ -387,12 +360,7 @@ def test_run_checks_skip_with_prior_results_reuses_cache():
     def my_check():
         raise AssertionError("Should not be executed when cache exists and SKIP")
 
-    app = Watchpost(
-        checks=[my_check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-        default_scheduling_strategies=[AlwaysSkipStrategy()],
-    )
+    app = make_app([my_check], default_scheduling_strategies=[_ALWAYS_SKIP])
 
     # Prime the cache with a prior OK result
     execution_result = ExecutionResult(
@@ -405,16 +373,14 @@ def test_run_checks_skip_with_prior_results_reuses_cache():
     )
     app._check_cache.store_check_results(my_check, TEST_ENVIRONMENT, [execution_result])
 
-    with patch("sys.stdout.buffer.write") as mock_write:
-        app.run_checks_once()
-        all_data = b"".join(call_args[0][0] for call_args in mock_write.call_args_list)
-        results = decode_checkmk_output(all_data)
-        result = next(r for r in results if r["service_name"] == "Skip with prior")
-        assert result["check_state"] == "OK"
-        assert result["summary"] == "Cached result"
+    app.run_checks_once()
+    results = decode_checkmk_output(stdout_sink.getvalue())
+    result = next(r for r in results if r["service_name"] == "Skip with prior")
+    assert result["check_state"] == "OK"
+    assert result["summary"] == "Cached result"
 
 
-def test_run_checks_reuses_cached_results_under_schedule():
+def test_run_checks_reuses_cached_results_under_schedule(make_app, stdout_sink):
     call_count = {"n": 0}
 
     @check(
@@ -427,43 +393,26 @@ def test_run_checks_reuses_cached_results_under_schedule():
         call_count["n"] += 1
         return ok(f"Run {call_count['n']}")
 
-    app = Watchpost(
-        checks=[my_check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
+    app = make_app([my_check])
 
     # First run: executes the check and stores the result in cache
-    with patch("sys.stdout.buffer.write") as mock_write1:
-        app.run_checks_once()
-        all_data1 = b"".join(
-            call_args[0][0] for call_args in mock_write1.call_args_list
-        )
-        results1 = decode_checkmk_output(all_data1)
-        res1 = next(r for r in results1 if r["service_name"] == "Cached schedule")
-        assert res1["summary"] == "Run 1"
-        assert call_count["n"] == 1
+    app.run_checks_once()
+    results1 = decode_checkmk_output(stdout_sink.getvalue())
+    res1 = next(r for r in results1 if r["service_name"] == "Cached schedule")
+    assert res1["summary"] == "Run 1"
+    assert call_count["n"] == 1
 
     # Second run: should reuse cached results, not execute the check again
-    with patch("sys.stdout.buffer.write") as mock_write2:
-        app.run_checks_once()
-        all_data2 = b"".join(
-            call_args[0][0] for call_args in mock_write2.call_args_list
-        )
-        results2 = decode_checkmk_output(all_data2)
-        res2 = next(r for r in results2 if r["service_name"] == "Cached schedule")
-        assert res2["summary"] == "Run 1"
-        assert call_count["n"] == 1
-
+    stdout_sink.seek(0)
+    stdout_sink.truncate()
+    app.run_checks_once()
+    results2 = decode_checkmk_output(stdout_sink.getvalue())
+    res2 = next(r for r in results2 if r["service_name"] == "Cached schedule")
+    assert res2["summary"] == "Run 1"
+    assert call_count["n"] == 1
 
-def test_run_checks_dont_schedule_produces_no_results():
-    from watchpost.scheduling_strategy import SchedulingDecision, SchedulingStrategy
-
-    class AlwaysDontScheduleStrategy(SchedulingStrategy):
-        @override
-        def schedule(self, check, current_execution_environment, target_environment):
-            return SchedulingDecision.DONT_SCHEDULE
 
+def test_run_checks_dont_schedule_produces_no_results(make_app, stdout_sink):
     @check(
         name="Dont schedule",
         service_labels={"test": "true"},
@@ -473,26 +422,19 @@ def test_run_checks_dont_schedule_produces_no_results():
     def my_check():
         raise AssertionError("Should not be executed when DONT_SCHEDULE")
 
-    app = Watchpost(
-        checks=[my_check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-        default_scheduling_strategies=[AlwaysDontScheduleStrategy()],
-    )
+    app = make_app([my_check], default_scheduling_strategies=[_ALWAYS_DONT_SCHEDULE])
 
-    with patch("sys.stdout.buffer.write") as mock_write:
-        app.run_checks_once()
-        all_data = b"".join(call_args[0][0] for call_args in mock_write.call_args_list)
-        results = decode_checkmk_output(all_data)
+    app.run_checks_once()
+    results = decode_checkmk_output(stdout_sink.getvalue())
 
-        # There should only be the synthetic "Run checks" result
-        assert len(results) == 1
-        assert results[0]["service_name"] == "Run checks"
-        # And definitely no result for our check
-        assert not any(r["service_name"] == "Dont schedule" for r in results)
+    # There should only be the synthetic "Run checks" result
+    assert len(results) == 1
+    assert results[0]["service_name"] == "Run checks"
+    # And definitely no result for our check
+    assert not any(r["service_name"] == "Dont schedule" for r in results)
 
 
-def test_datasource_unavailable_without_cache_returns_unknown():
+def test_datasource_unavailable_without_cache_returns_unknown(make_app, stdout_sink):
     @check(
         name="DS Unavailable",
         service_labels={"test": "true"},
@@ -502,16 +444,10 @@ def test_datasource_unavailable_without_cache_returns_unknown():
     def failing_check():
         raise DatasourceUnavailable("temporary outage")
 
-    app = Watchpost(
-        checks=[failing_check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
+    app = make_app([failing_check])
 
-    with patch("sys.stdout.buffer.write") as mock_write:
-        app.run_checks_once()
-        all_data = b"".join(call_args[0][0] for call_args in mock_write.call_args_list)
-        results = decode_checkmk_output(all_data)
+    app.run_checks_once()
+    results = decode_checkmk_output(stdout_sink.getvalue())
 
     result = next(r for r in results if r["service_name"] == "DS Unavailable")
     assert result["check_state"] == "UNKNOWN"
@@ -523,14 +459,25 @@ def test_datasource_unavailable_without_cache_returns_unknown():
     assert any(r["service_name"] == "Run checks" for r in results)
 
 
-def test_datasource_unavailable_with_expired_cache_returns_enriched_cached_result():
+def test_datasource_unavailable_with_expired_cache_returns_enriched_cached_result(
+    make_app,
+    stdout_sink,
+    monkeypatch,
+):
     calls = {"n": 0}
+    fake_now = [time.time()]
+
+    # Control the clock the cache checks expiry against, so expiry does not
+    # depend on real time passing.
+    monkeypatch.setattr(
+        "watchpost.cache.time", SimpleNamespace(time=lambda: fake_now[0])
+    )
 
     @check(
         name="DS Unavailable Cached",
         service_labels={"test": "true"},
         environments=[TEST_ENVIRONMENT],
-        cache_for=timedelta(microseconds=1),
+        cache_for=timedelta(seconds=1),
     )
     def flaky_check():
         calls["n"] += 1
@@ -538,31 +485,24 @@ def test_datasource_unavailable_with_expired_cache_returns_enriched_cached_resul
             return ok("Cached ok")
         raise DatasourceUnavailable("backend down")
 
-    app = Watchpost(
-        checks=[flaky_check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
+    app = make_app([flaky_check])
 
     # First run: stores OK in cache
-    with patch("sys.stdout.buffer.write") as mock_write1:
-        app.run_checks_once()
-        all_data1 = b"".join(
-            call_args[0][0] for call_args in mock_write1.call_args_list
-        )
-        results1 = decode_checkmk_output(all_data1)
-        res1 = next(r for r in results1 if r["service_name"] == "DS Unavailable Cached")
-        assert res1["check_state"] == "OK"
-        assert res1["summary"] == "Cached ok"
+    app.run_checks_once()
+    results1 = decode_checkmk_output(stdout_sink.getvalue())
+    res1 = next(r for r in results1 if r["service_name"] == "DS Unavailable Cached")
+    assert res1["check_state"] == "OK"
+    assert res1["summary"] == "Cached ok"
+
+    # Let the cached result expire
+    fake_now[0] += 10
 
     # Second run: raises DatasourceUnavailable, should reuse cached result with enriched details
-    with patch("sys.stdout.buffer.write") as mock_write2:
-        app.run_checks_once()
-        all_data2 = b"".join(
-            call_args[0][0] for call_args in mock_write2.call_args_list
-        )
-        results2 = decode_checkmk_output(all_data2)
-        res2 = next(r for r in results2 if r["service_name"] == "DS Unavailable Cached")
+    stdout_sink.seek(0)
+    stdout_sink.truncate()
+    app.run_checks_once()
+    results2 = decode_checkmk_output(stdout_sink.getvalue())
+    res2 = next(r for r in results2 if r["service_name"] == "DS Unavailable Cached")
 
     assert res2["check_state"] == "OK"
     assert res2["summary"] == "Cached ok"
@@ -636,7 +576,7 @@ def test_cache_is_used_only_if_no_fresh_results_available():
     assert service_results[0]["summary"] == "Live result"  # not "Cached OK"
 
 
-def test_verify_check_scheduling_reports_missing_required_kwargs() -> None:
+def test_verify_check_scheduling_reports_missing_required_kwargs(make_app) -> None:
     # Define a check function that declares a parameter which Watchpost cannot provide
     # (it's not an Environment nor a Datasource-typed argument)
     def my_check(foo: int):
@@ -651,11 +591,7 @@ def test_verify_check_scheduling_reports_missing_required_kwargs() -> None:
         cache_for=None,
     )
 
-    app = Watchpost(
-        checks=[check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
+    app = make_app([check])
 
     with pytest.raises(ExceptionGroup) as eg:
         app.verify_check_scheduling(force=True)
@@ -679,7 +615,7 @@ class MissingDatasource(Datasource):
     pass
 
 
-def test_verify_check_scheduling_wraps_datasource_resolution_errors() -> None:
+def test_verify_check_scheduling_wraps_datasource_resolution_errors(make_app) -> None:
     # Define a datasource type that is NOT registered with the app
 
     # The check requires the unregistered datasource, which should cause
@@ -696,11 +632,7 @@ def test_verify_check_scheduling_wraps_datasource_resolution_errors() -> None:
         cache_for=None,
     )
 
-    app = Watchpost(
-        checks=[check],
-        execution_environment=TEST_ENVIRONMENT,
-        executor=BlockingCheckExecutor(),
-    )
+    app = make_app([check])
 
     with pytest.raises(ExceptionGroup) as eg:
         app.verify_check_scheduling(force=True)
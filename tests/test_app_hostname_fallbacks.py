@@ -18,6 +18,8 @@ from __future__ import annotations
 
 from typing import Any, override
 
+import pytest
+
 from watchpost.app import Watchpost
 from watchpost.check import check
 from watchpost.datasource import DatasourceUnavailable
@@ -56,107 +58,54 @@ class AlwaysSkipStrategy(SchedulingStrategy):
         return SchedulingDecision.SKIP
 
 
-def _mk_check_with_static_hostname(env: Environment):
-    @check(
-        name="svc",
-        service_labels={},
-        environments=[env],
-        cache_for=None,
-        hostname="check-host",
-    )
-    def my_check():
-        # Will not actually be called in these tests
-        return ok("unused")
-
-    return my_check
-
-
-def test_hostname_on_skip_without_prior_results_is_resolved():
-    env = Environment("prod")
-    my_check = _mk_check_with_static_hostname(env)
-
-    app = Watchpost(
-        checks=[my_check],
-        execution_environment=Environment("exec-env"),
-        executor=FakeExecutor(behavior=None),  # not used for SKIP without cache
-        default_scheduling_strategies=[AlwaysSkipStrategy()],
-        hostname_fallback_to_default_hostname_generation=False,
-        hostname_coerce_into_valid_hostname=False,
-    )
-
-    with app.app_context():
-        results = app._run_check(
-            check=my_check,
-            environment=env,
-            instantiable_datasources={},
-        )  # type: ignore[arg-type]
-    assert results is not None
-    assert len(results) == 1
-    assert results[0].piggyback_host == "check-host"
-
-
-def test_hostname_on_datasource_unavailable_without_cache_is_resolved():
-    env = Environment("prod")
-    my_check = _mk_check_with_static_hostname(env)
-
-    app = Watchpost(
-        checks=[my_check],
-        execution_environment=Environment("exec-env"),
-        executor=FakeExecutor(behavior=DatasourceUnavailable("temporary outage")),
-        hostname_fallback_to_default_hostname_generation=False,
-        hostname_coerce_into_valid_hostname=False,
-    )
-
-    with app.app_context():
-        results = app._run_check(
-            check=my_check,
-            environment=env,
-            instantiable_datasources={},
-        )  # type: ignore[arg-type]
-    assert results is not None
-    assert len(results) == 1
-    assert results[0].piggyback_host == "check-host"
-
-
-def test_hostname_on_generic_exception_is_resolved():
-    env = Environment("prod")
-    my_check = _mk_check_with_static_hostname(env)
-
-    app = Watchpost(
-        checks=[my_check],
-        execution_environment=Environment("exec-env"),
-        executor=FakeExecutor(behavior=RuntimeError("boom")),
-        hostname_fallback_to_default_hostname_generation=False,
-        hostname_coerce_into_valid_hostname=False,
-    )
-
-    with app.app_context():
-        results = app._run_check(
-            check=my_check,
-            environment=env,
-            instantiable_datasources={},
-        )  # type: ignore[arg-type]
-    assert results is not None
-    assert len(results) == 1
-    assert results[0].piggyback_host == "check-host"
-
-
-def test_hostname_on_async_first_run_is_resolved():
-    env = Environment("prod")
-    my_check = _mk_check_with_static_hostname(env)
-
+TARGET_ENVIRONMENT = Environment("prod")
+EXECUTION_ENVIRONMENT = Environment("exec-env")
+
+
+@check(
+    name="svc",
+    service_labels={},
+    environments=[TARGET_ENVIRONMENT],
+    cache_for=None,
+    hostname="check-host",
+)
+def check_with_static_hostname():
+    # Will not actually be called in these tests
+    return ok("unused")
+
+
+@pytest.mark.parametrize(
+    ("behavior", "scheduling_strategies"),
+    [
+        # Not used for SKIP without cache
+        pytest.param(None, [AlwaysSkipStrategy()], id="skip-without-prior-results"),
+        pytest.param(
+            DatasourceUnavailable("temporary outage"),
+            None,
+            id="datasource-unavailable-without-cache",
+        ),
+        pytest.param(RuntimeError("boom"), None, id="generic-exception"),
+        # result() returns None => async path
+        pytest.param(None, None, id="async-first-run"),
+    ],
+)
+def test_hostname_on_fallback_result_is_resolved(
+    behavior: Any,
+    scheduling_strategies: list[SchedulingStrategy] | None,
+):
     app = Watchpost(
-        checks=[my_check],
-        execution_environment=Environment("exec-env"),
-        executor=FakeExecutor(behavior=None),  # result() returns None => async path
+        checks=[check_with_static_hostname],
+        execution_environment=EXECUTION_ENVIRONMENT,
+        executor=FakeExecutor(behavior=behavior),
+        default_scheduling_strategies=scheduling_strategies,
         hostname_fallback_to_default_hostname_generation=False,
         hostname_coerce_into_valid_hostname=False,
     )
 
     with app.app_context():
         results = app._run_check(
-            check=my_check,
-            environment=env,
+            check=check_with_static_hostname,
+            environment=TARGET_ENVIRONMENT,
             instantiable_datasources={},
         )  # type: ignore[arg-type]
     assert results is not None
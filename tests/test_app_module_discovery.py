@@ -18,8 +18,6 @@ from __future__ import annotations
 
 import importlib
 import uuid
-from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 
@@ -30,12 +28,27 @@ from watchpost.executor import BlockingCheckExecutor
 
 from .utils import decode_checkmk_output
 
-
-@pytest.fixture()
-def temp_pkg(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+# Common template for modules that define a Check
+_CHECK_MODULE_SRC = (
+    "from watchpost.check import check\n"
+    "from watchpost.environment import Environment\n"
+    "env = Environment('E')\n"
+    "@check(name='{svc}', service_labels={{}}, environments=[env], cache_for=None)\n"
+    "def {fn}():\n"
+    "    return []\n"
+)
+_CHECK_A_SRC = _CHECK_MODULE_SRC.format(svc="svc_a", fn="check_a").encode()
+_CHECK_B_SRC = _CHECK_MODULE_SRC.format(svc="svc_b", fn="check_b").encode()
+
+
+@pytest.fixture(scope="session")
+def temp_pkg(tmp_path_factory: pytest.TempPathFactory):
     """
     Create a temporary package with nested modules that define checks.
 
+    The package is only read by the tests, so it is created and imported once
+    per session.
+
     Layout:
     temp_pkg/
       __init__.py
@@ -51,41 +64,26 @@ def temp_pkg(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
     # created do not overlap with any other tests, given the modification of the
     # syspath below.
     random_id = uuid.uuid4().hex
+    tmp_path = tmp_path_factory.mktemp("discovery")
     pkg = tmp_path / f"temp_pkg_{random_id}"
     (pkg / "a").mkdir(parents=True)
     (pkg / "b").mkdir(parents=True)
 
-    # Common helper for modules that define a Check
-    check_module_src = (
-        "from watchpost.check import check\n"
-        "from watchpost.environment import Environment\n"
-        "env = Environment('E')\n"
-        "@check(name='{svc}', service_labels={{}}, environments=[env], cache_for=None)\n"
-        "def {fn}():\n"
-        "    return []\n"
-    )
-
-    # a/mod.py defines check_a
-    (pkg / "a" / "__init__.py").write_text("")
-    (pkg / "a" / "mod.py").write_text(
-        check_module_src.format(svc="svc_a", fn="check_a")
-    )
-
-    # b/mod.py defines check_b
-    (pkg / "b" / "__init__.py").write_text("")
-    (pkg / "b" / "mod.py").write_text(
-        check_module_src.format(svc="svc_b", fn="check_b")
-    )
+    # a/mod.py defines check_a, b/mod.py defines check_b
+    (pkg / "a" / "__init__.py").write_bytes(b"")
+    (pkg / "a" / "mod.py").write_bytes(_CHECK_A_SRC)
+    (pkg / "b" / "__init__.py").write_bytes(b"")
+    (pkg / "b" / "mod.py").write_bytes(_CHECK_B_SRC)
 
     # root __init__
-    (pkg / "__init__.py").write_text("")
+    (pkg / "__init__.py").write_bytes(b"")
 
-    # Make tmp package importable
-    monkeypatch.syspath_prepend(str(tmp_path))
+    # Make tmp package importable for the rest of the session
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.syspath_prepend(str(tmp_path))
 
-    # Import and return the package module for convenience
-    mod = importlib.import_module(f"temp_pkg_{random_id}")
-    return mod
+        # Import and return the package module for convenience
+        yield importlib.import_module(f"temp_pkg_{random_id}")
 
 
 def test_watchpost_accepts_module_and_discovers_checks(temp_pkg):
@@ -101,7 +99,9 @@ def test_watchpost_accepts_module_and_discovers_checks(temp_pkg):
     assert names == ["svc_a", "svc_b"]
 
 
-def test_watchpost_mixed_checks_and_module_discovery_and_run_once(temp_pkg):
+def test_watchpost_mixed_checks_and_module_discovery_and_run_once(
+    temp_pkg, stdout_sink
+):
     env = Environment("E")
 
     @check(name="svc_direct", service_labels={}, environments=[env], cache_for=None)
@@ -119,18 +119,16 @@ def test_watchpost_mixed_checks_and_module_discovery_and_run_once(temp_pkg):
     assert names == ["svc_a", "svc_b", "svc_direct"]
 
     # Capture Checkmk output and ensure the synthetic "Run checks" entry mentions all checks
-    with patch("sys.stdout.buffer.write") as mock_write:
-        app.run_checks_once()
-
-        all_data = b"".join(call_args[0][0] for call_args in mock_write.call_args_list)
-        results = decode_checkmk_output(all_data)
-
-        # Find the synthetic result
-        synthetic = next(r for r in results if r["service_name"] == "Run checks")
-        assert synthetic["summary"] == f"Ran {len(app.checks)} checks"
-        # Details should list all discovered checks; accept either service_name or function path
-        details = synthetic["details"] or ""
-        assert "Check functions:\n- " in details
-        for chk in app.checks:
-            # Either the human-facing service name or the fully-qualified function name
-            assert f"- {chk.name}" in details
+    app.run_checks_once()
+
+    results = decode_checkmk_output(stdout_sink.getvalue())
+
+    # Find the synthetic result
+    synthetic = next(r for r in results if r["service_name"] == "Run checks")
+    assert synthetic["summary"] == f"Ran {len(app.checks)} checks"
+    # Details should list all discovered checks; accept either service_name or function path
+    details = synthetic["details"] or ""
+    assert "Check functions:\n- " in details
+    for chk in app.checks:
+        # Either the human-facing service name or the fully-qualified function name
+        assert f"- {chk.name}" in details
@@ -18,19 +18,34 @@ from __future__ import annotations
 
 from concurrent.futures import wait
 from datetime import UTC, datetime, timedelta
+from threading import Barrier
 
 from watchpost.app import Watchpost
 from watchpost.cache import CacheEntry, CacheKey, InMemoryStorage
-from watchpost.check import check
+from watchpost.check import Check, check
 from watchpost.environment import Environment
 from watchpost.executor import CheckExecutor
 from watchpost.result import CheckState, ExecutionResult, ok
 
 from .utils import decode_checkmk_output, with_event
 
+# Upper bound for any wait in these tests, so a bug fails the test instead of
+# hanging it.
+TIMEOUT = 5.0
 
-def _collect_output(app: Watchpost) -> bytes:
-    return b"".join(app.run_checks())
+
+def _collect_output(app: Watchpost) -> bytearray:
+    output = bytearray()
+    for chunk in app.run_checks():
+        output.extend(chunk)
+    return output
+
+
+def _index_by_service_name(results: list[dict]) -> dict[str, dict]:
+    by_name = {r["service_name"]: r for r in results}
+    # Every service must be reported exactly once
+    assert len(by_name) == len(results)
+    return by_name
 
 
 def test_run_checks_returns_placeholder_until_result_is_ready():
@@ -49,7 +64,7 @@ def test_run_checks_returns_placeholder_until_result_is_ready():
             cache_for=None,  # ensure resubmit behavior each run
         )
         def my_check() -> object:
-            event.wait()
+            assert event.wait(timeout=TIMEOUT)
             return ok("All good")
 
         app = Watchpost(
@@ -64,29 +79,25 @@ def test_run_checks_returns_placeholder_until_result_is_ready():
         results1 = decode_checkmk_output(output1)
 
         # Assert 1: We should see the placeholder UNKNOWN for our service
-        service_results1 = [
-            r for r in results1 if r["service_name"] == "nonblocking-service"
-        ]
-        assert len(service_results1) == 1
-        assert service_results1[0]["environment"] == env.name
-        assert service_results1[0]["check_state"] == "UNKNOWN"
+        by_name1 = _index_by_service_name(results1)
+        service_result1 = by_name1["nonblocking-service"]
+        assert service_result1["environment"] == env.name
+        assert service_result1["check_state"] == "UNKNOWN"
         assert (
-            service_results1[0]["summary"]
+            service_result1["summary"]
             == "Check is running asynchronously and first results are not available yet"
         )
 
         # The synthetic 'Run checks' result should also be present
-        assert any(r["service_name"] == "Run checks" for r in results1)
+        assert "Run checks" in by_name1
 
         # Act 2: Second run without setting the event yet should still yield UNKNOWN
         output2 = _collect_output(app)
         results2 = decode_checkmk_output(output2)
-        service_results2 = [
-            r for r in results2 if r["service_name"] == "nonblocking-service"
-        ]
-        assert len(service_results2) == 1
-        assert service_results2[0]["check_state"] == "UNKNOWN"
-        assert any(r["service_name"] == "Run checks" for r in results2)
+        by_name2 = _index_by_service_name(results2)
+        service_result2 = by_name2["nonblocking-service"]
+        assert service_result2["check_state"] == "UNKNOWN"
+        assert "Run checks" in by_name2
 
 
 def test_run_checks_returns_final_result_after_event_is_set():
@@ -106,7 +117,7 @@ def test_run_checks_returns_final_result_after_event_is_set():
             cache_for=None,  # ensure resubmit behavior each run
         )
         def my_check() -> object:
-            event.wait()
+            assert event.wait(timeout=TIMEOUT)
             return ok("All good")
 
         app = Watchpost(
@@ -119,11 +130,8 @@ def test_run_checks_returns_final_result_after_event_is_set():
         # Act 1: First run while the event is not set -> expect UNKNOWN placeholder
         output1 = _collect_output(app)
         results1 = decode_checkmk_output(output1)
-        service_results1 = [
-            r for r in results1 if r["service_name"] == "nonblocking-service"
-        ]
-        assert len(service_results1) == 1
-        assert service_results1[0]["check_state"] == "UNKNOWN"
+        service_result1 = _index_by_service_name(results1)["nonblocking-service"]
+        assert service_result1["check_state"] == "UNKNOWN"
 
         # Signal the check can complete and wait for the first submitted future to finish
         event.set()
@@ -131,22 +139,90 @@ def test_run_checks_returns_final_result_after_event_is_set():
         key_state = executor._state.get(key)
         assert key_state, "future should be present for failing check"
         assert key_state.active_futures, "future should be present for failing check"
-        wait(executor._state[key].active_futures, return_when="ALL_COMPLETED")
+        _, not_done = wait(
+            executor._state[key].active_futures,
+            timeout=TIMEOUT,
+            return_when="ALL_COMPLETED",
+        )
+        assert not not_done
 
         # Act 2: Second run -> expect OK from finished result
         output2 = _collect_output(app)
         results2 = decode_checkmk_output(output2)
 
-        service_results2 = [
-            r for r in results2 if r["service_name"] == "nonblocking-service"
-        ]
-        assert len(service_results2) == 1
-        assert service_results2[0]["environment"] == env.name
-        assert service_results2[0]["check_state"] == "OK"
-        assert service_results2[0]["summary"] == "All good"
+        by_name2 = _index_by_service_name(results2)
+        service_result2 = by_name2["nonblocking-service"]
+        assert service_result2["environment"] == env.name
+        assert service_result2["check_state"] == "OK"
+        assert service_result2["summary"] == "All good"
 
         # The synthetic 'Run checks' result should also be present
-        assert any(r["service_name"] == "Run checks" for r in results2)
+        assert "Run checks" in by_name2
+
+
+def test_run_checks_runs_independent_checks_in_parallel():
+    env = Environment("env-nonblocking")
+    watchpost_env = Environment("watchpost-env")
+    parallelism = 4
+    # Every check waits until all of them are running at the same time, which
+    # can only happen if the executor runs them in parallel. If it does not,
+    # the barrier times out and the checks report CRIT.
+    barrier = Barrier(parallelism, timeout=TIMEOUT)
+
+    def make_check(index: int) -> Check:
+        def barrier_check() -> object:
+            barrier.wait()
+            return ok(f"Check {index}")
+
+        # The check name is derived from the qualified name and has to be
+        # unique, since it is part of the executor and cache keys.
+        barrier_check.__qualname__ = f"barrier_check_{index}"
+        return Check(
+            check_function=barrier_check,
+            service_name=f"parallel-service-{index}",
+            service_labels={},
+            environments=[env],
+            # Caching avoids resubmitting the checks on the second run.
+            cache_for=timedelta(minutes=1),
+        )
+
+    checks = [make_check(index) for index in range(parallelism)]
+
+    with CheckExecutor(max_workers=parallelism) as executor:
+        app = Watchpost(
+            checks=checks,
+            execution_environment=watchpost_env,
+            executor=executor,
+            version="test",
+        )
+
+        # Act 1: The first run submits every check without waiting for them
+        _collect_output(app)
+        _, not_done = wait(
+            [
+                future
+                for key_state in executor._state.values()
+                for future in key_state.active_futures
+            ],
+            timeout=TIMEOUT,
+            return_when="ALL_COMPLETED",
+        )
+        assert not not_done
+
+        # Act 2: The second run picks up the finished (or already cached) results
+        results = decode_checkmk_output(_collect_output(app))
+
+    # Assert: all checks succeeded, and their results keep the check order
+    service_results = [
+        r for r in results if r["service_name"].startswith("parallel-service-")
+    ]
+    assert [r["service_name"] for r in service_results] == [
+        f"parallel-service-{index}" for index in range(parallelism)
+    ]
+    assert [r["summary"] for r in service_results] == [
+        f"Check {index}" for index in range(parallelism)
+    ]
+    assert all(r["check_state"] == "OK" for r in service_results)
 
 
 def test_executor_errored_integration_nonblocking():
@@ -165,7 +241,7 @@ def test_executor_errored_integration_nonblocking():
             cache_for="1m",
         )
         def failing_check() -> object:
-            event.wait()
+            assert event.wait(timeout=TIMEOUT)
             raise ValueError("boom")
 
         app = Watchpost(
@@ -178,8 +254,8 @@ def test_executor_errored_integration_nonblocking():
         # First run: ensures submission and returns placeholder UNKNOWN
         output1 = b"".join(app.run_checks())
         results1 = decode_checkmk_output(output1)
-        sr1 = [r for r in results1 if r["service_name"] == "failing-service"]
-        assert len(sr1) == 1 and sr1[0]["check_state"] == "UNKNOWN"
+        sr1 = _index_by_service_name(results1)["failing-service"]
+        assert sr1["check_state"] == "UNKNOWN"
 
         # Let the check complete with an error and wait for its future
         key = (failing_check.name, env.name)
@@ -187,7 +263,12 @@ def test_executor_errored_integration_nonblocking():
         key_state = executor._state.get(key)
         assert key_state, "future should be present for failing check"
         assert key_state.active_futures, "future should be present for failing check"
-        wait(executor._state[key].active_futures, return_when="ALL_COMPLETED")
+        _, not_done = wait(
+            executor._state[key].active_futures,
+            timeout=TIMEOUT,
+            return_when="ALL_COMPLETED",
+        )
+        assert not not_done
 
         # Before pickup: errored() should report the error with a key string
         errs = executor.errored()
@@ -200,11 +281,10 @@ def test_executor_errored_integration_nonblocking():
         # Next run should attempt to pick up the errored future and create a CRIT result
         output2 = b"".join(app.run_checks())
         results2 = decode_checkmk_output(output2)
-        sr2 = [r for r in results2 if r["service_name"] == "failing-service"]
-        assert len(sr2) == 1
-        assert sr2[0]["check_state"] == "CRIT"
-        assert sr2[0]["summary"] == "boom"
-        assert "ValueError: boom" in sr2[0]["details"]
+        sr2 = _index_by_service_name(results2)["failing-service"]
+        assert sr2["check_state"] == "CRIT"
+        assert sr2["summary"] == "boom"
+        assert "ValueError: boom" in sr2["details"]
 
         # After pickup, errored() must be cleared
         assert executor.errored() == {}
@@ -243,7 +323,7 @@ def test_async_uses_expired_cached_results_when_available_with_cache_for():
             cache_for="1s",  # cached entries are normally short-lived
         )
         def my_check() -> object:
-            event.wait()
+            assert event.wait(timeout=TIMEOUT)
             return ok("Live result")
 
         # Pre-populate an expired cached result for this check/environment key
@@ -273,13 +353,10 @@ def test_async_uses_expired_cached_results_when_available_with_cache_for():
         results = decode_checkmk_output(output)
 
         # Assert: we should receive the cached result (OK, summary "Cached OK")
-        service_results = [
-            r for r in results if r["service_name"] == "nonblocking-service"
-        ]
-        assert len(service_results) == 1
-        assert service_results[0]["environment"] == env.name
-        assert service_results[0]["check_state"] == "OK"
-        assert service_results[0]["summary"] == "Cached OK"
+        service_result = _index_by_service_name(results)["nonblocking-service"]
+        assert service_result["environment"] == env.name
+        assert service_result["check_state"] == "OK"
+        assert service_result["summary"] == "Cached OK"
 
 
 def test_async_uses_expired_cached_results_when_available_with_cache_for_none():
@@ -301,7 +378,7 @@ def test_async_uses_expired_cached_results_when_available_with_cache_for_none():
             cache_for=None,  # always resubmit, but should still honor persistent cached results
         )
         def my_check() -> object:
-            event.wait()
+            assert event.wait(timeout=TIMEOUT)
             return ok("Live result")
 
         # Pre-populate an expired cached result for this check/environment key
@@ -331,10 +408,7 @@ def test_async_uses_expired_cached_results_when_available_with_cache_for_none():
         results = decode_checkmk_output(output)
 
         # Assert: we should receive the cached result (OK, summary "Cached OK")
-        service_results = [
-            r for r in results if r["service_name"] == "nonblocking-service"
-        ]
-        assert len(service_results) == 1
-        assert service_results[0]["environment"] == env.name
-        assert service_results[0]["check_state"] == "OK"
-        assert service_results[0]["summary"] == "Cached OK"
+        service_result = _index_by_service_name(results)["nonblocking-service"]
+        assert service_result["environment"] == env.name
+        assert service_result["check_state"] == "OK"
+        assert service_result["summary"] == "Cached OK"
@@ -17,7 +17,6 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import patch
 
 from watchpost.app import Watchpost
 from watchpost.check import Check, check
@@ -121,7 +120,7 @@ def test_run_sync_and_run_async_parity():
     assert normalize(sync_results) == normalize(async_results)
 
 
-def test_app_runs_async_check_and_emits_output():
+def test_app_runs_async_check_and_emits_output(stdout_sink):
     """Integration: Watchpost should run an async check and produce Checkmk output."""
 
     @check(
@@ -143,10 +142,8 @@ def test_app_runs_async_check_and_emits_output():
     app.register_datasource(DummyDatasource)
 
     # Capture stdout writes of the Checkmk output
-    with patch("sys.stdout.buffer.write") as mock_write:
-        app.run_checks_once()
-        all_data = b"".join(call_args[0][0] for call_args in mock_write.call_args_list)
-        results = decode_checkmk_output(all_data)
+    app.run_checks_once()
+    results = decode_checkmk_output(stdout_sink.getvalue())
 
     # Should include both our check and the synthetic "Run checks"
     assert any(r["service_name"] == "async-check" for r in results)
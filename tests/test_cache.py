@@ -14,14 +14,18 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import itertools
+import os
+import pickle
 import re
+import stat
+import threading
 from datetime import UTC, datetime, timedelta
-from tempfile import TemporaryDirectory
 from typing import cast
 
 import pytest
 import redis
-from testcontainers.redis import RedisContainer
 
 from watchpost.cache import (
     Cache,
@@ -34,242 +38,119 @@ from watchpost.cache import (
 )
 
 
-class TestDiskStorage:
-    def test_directory_handling(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            assert disk_storage.directory.exists()
-            assert disk_storage.directory.is_dir()
-
-    def test_unknown_key(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-            assert cache.get("key") is None
-
-    def test_unknown_key_with_default(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-            default = "default"
-            cache_entry = cache.get("key", default=default)
-            assert cache_entry is not None
-            assert cache_entry.cache_key.key == "key"
-            assert cache_entry.cache_key.package == __package__
-            assert cache_entry.value == default
-            assert cache_entry.added_at is None
-            assert cache_entry.ttl is None
-
-    def test_cache_key_uniqueness(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-
-            cache.store("key", "value")
-            cache.store("key", "updated-value")
-            cache_entry = cache.get("key")
-
-            assert cache_entry is not None
-            assert cache_entry.cache_key.key == "key"
-            assert cache_entry.cache_key.package == __package__
-            assert cache_entry.value == "updated-value"
-            assert cache_entry.added_at is not None
-            assert cache_entry.ttl is None
-            assert cache_entry.is_expired() is False
-
-    def test_basic_store_and_get(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-
-            stored_cache_entry = cache.store("key", "value")
-            cache_entry = cache.get("key")
-
-            assert cache_entry is not None
-            assert stored_cache_entry is not None
-            assert cache_entry == stored_cache_entry
-            assert cache_entry.cache_key.key == "key"
-            assert cache_entry.cache_key.package == __package__
-            assert cache_entry.value == "value"
-            assert cache_entry.added_at is not None
-            assert cache_entry.ttl is None
-            assert cache_entry.is_expired() is False
-
-    def test_store_with_package(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-
-            cache.store("key", "value", package="test")
-            cache_entry = cache.get("key", package="test")
-
-            assert cache_entry is not None
-            assert cache_entry.cache_key.key == "key"
-            assert cache_entry.cache_key.package == "test"
-            assert cache_entry.value == "value"
-            assert cache_entry.added_at is not None
-            assert cache_entry.ttl is None
-            assert cache_entry.is_expired() is False
-
-    def test_ttl_works(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-
-            cache.store("key", "value", ttl=timedelta(seconds=-1))
-            cache_entry_path = disk_storage._get_file_path(
-                CacheKey(key="key", package=cast(str, __package__))
-            )
-
-            assert cache_entry_path.exists()
-            assert cache.get("key") is None
-            assert not cache_entry_path.exists()
+class TestCacheKey:
+    def test_hash_and_equality(self):
+        cache_key = CacheKey(key="key", package="test")
+        assert cache_key == CacheKey(key="key", package="test")
+        assert hash(cache_key) == hash(CacheKey(key="key", package="test"))
+        assert cache_key != CacheKey(key="key", package="other")
 
-    def test_return_expired(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
+    def test_pickle_roundtrip(self):
+        cache_key = CacheKey(key="key", package="test")
 
-            cache.store("key", "value", ttl=timedelta(seconds=-1))
-            cache_entry_path = disk_storage._get_file_path(
-                CacheKey(key="key", package=cast(str, __package__))
-            )
+        unpickled = pickle.loads(pickle.dumps(cache_key))
+        assert unpickled == cache_key
+        assert hash(unpickled) == hash(cache_key)
 
-            assert cache_entry_path.exists()
-            cache_entry = cache.get("key", return_expired=True)
-            assert cache_entry is not None
-            assert cache_entry.cache_key.key == "key"
-            assert cache_entry.cache_key.package == __package__
-            assert cache_entry.value == "value"
-            assert cache_entry.added_at is not None
-            assert cache_entry.ttl == timedelta(seconds=-1)
-            assert cache_entry.is_expired() is True
-            assert not cache_entry_path.exists()
-
-    def test_memoize_with_key(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-
-            @cache.memoize(key="memoize-key")
-            def memoized_function(a):
-                return a
 
-            assert memoized_function(1) == 1
-            cache_key = CacheKey(
-                key="memoize-key",
-                package=cast(str, __package__),
-            )
-            cache_entry_path = disk_storage._get_file_path(cache_key)
-            assert cache_entry_path.exists()
-            # memoize currently does not cache by the arguments provided, so providing
-            # something else will still return the prior value while the cache is active
-            assert memoized_function(2) == 1
+class TestCacheEntry:
+    def test_is_expired(self):
+        cache_key = CacheKey(key="key", package="test")
+        now = datetime.now(tz=UTC)
+        assert not CacheEntry(cache_key, "value", added_at=None, ttl=None).is_expired()
+        assert not CacheEntry(cache_key, "value", added_at=now, ttl=None).is_expired()
+        assert not CacheEntry(
+            cache_key, "value", added_at=now, ttl=timedelta(hours=1)
+        ).is_expired()
+        assert CacheEntry(
+            cache_key, "value", added_at=now, ttl=timedelta(seconds=-1)
+        ).is_expired()
 
-            cache_entry = disk_storage.get(cache_key)
-            assert cache_entry is not None
-            disk_storage._remove_cache_entry_on_disk(cache_entry)
-            assert memoized_function(2) == 2
+    def test_expiry_follows_reassigned_fields(self):
+        cache_entry = CacheEntry(
+            CacheKey(key="key", package="test"),
+            "value",
+            added_at=datetime.now(tz=UTC),
+            ttl=timedelta(hours=1),
+        )
+        assert cache_entry.is_expired() is False
 
-    def test_memoize_with_key_generator(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-
-            def key_generator(*args, **_kwargs) -> str:
-                return str(args[0])
-
-            @cache.memoize(key_generator=key_generator)
-            def memoized_function(_a):
-                return datetime.now(tz=UTC)
-
-            call_1 = memoized_function(1)
-            assert isinstance(call_1, datetime)
-            cache_key = CacheKey(
-                key="1",
-                package=cast(str, __package__),
-            )
-            cache_entry_path = disk_storage._get_file_path(cache_key)
-            assert cache_entry_path.exists()
-
-            # Repeat calls return the same result
-            assert memoized_function(1) == call_1
-            # Calls with a different argument return a different result
-            call_2 = memoized_function(2)
-            assert isinstance(call_2, datetime)
-            assert call_2 > call_1
-
-    def test_memoize_without_key_or_key_generator(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-
-            with pytest.raises(
-                ValueError,
-                match=re.escape("Either key or key_generator must be provided."),
-            ):
-
-                @cache.memoize()
-                def memoized_function(a):
-                    return a
-
-    def test_memoize_with_both_key_and_key_generator(self):
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
-
-            def key_generator(*_args, **_kwargs) -> str:
-                return "something"
-
-            with pytest.raises(
-                ValueError,
-                match=re.escape("Only one of key or key_generator can be provided."),
-            ):
-
-                @cache.memoize(key="something", key_generator=key_generator)
-                def memoized_function(a):
-                    return a
+        cache_entry.ttl = timedelta(seconds=-1)
+        assert cache_entry.is_expired() is True
 
-    def test_memoize_with_formattable_key(self):
-        """Test that memoize formats a key string using function arguments."""
-        with TemporaryDirectory() as tmpdir:
-            disk_storage = DiskStorage(tmpdir)
-            cache = Cache(disk_storage)
+        cache_entry.added_at = None
+        assert cache_entry.is_expired() is False
 
-            @cache.memoize(key="user-{a}-{b}")
-            def memoized_function(a, b):
-                _ = a
-                _ = b
-                return datetime.now(tz=UTC)
+    def test_pickle_roundtrip_keeps_expiry(self):
+        cache_entry = CacheEntry(
+            CacheKey(key="key", package="test"),
+            "value",
+            added_at=datetime.now(tz=UTC),
+            ttl=timedelta(seconds=-1),
+        )
+        assert pickle.loads(pickle.dumps(cache_entry)).is_expired() is True
 
-            # First call should store using formatted key
-            call_1 = memoized_function(1, 2)
-            assert isinstance(call_1, datetime)
-            cache_key = CacheKey(key="user-1-2", package=cast(str, __package__))
-            cache_entry_path = disk_storage._get_file_path(cache_key)
-            assert cache_entry_path.exists()
 
-            # Repeated call with same args returns cached value
-            assert memoized_function(1, 2) == call_1
+@pytest.fixture(scope="session")
+def shared_disk_storage(tmp_path_factory: pytest.TempPathFactory) -> DiskStorage:
+    """
+    A `DiskStorage` shared across the session.
 
-            # Calling with kwargs in different order should resolve to same key/value
-            assert memoized_function(b=2, a=1) == call_1
+    Only use this for tests that never store anything, so they cannot influence
+    each other.
+    """
+    return DiskStorage(str(tmp_path_factory.mktemp("shared-disk-storage")))
 
-            # Different arguments produce a different cache entry and value
-            call_2 = memoized_function(2, 2)
-            assert isinstance(call_2, datetime)
-            assert call_2 > call_1
 
+class TestStorage:
+    """Behavior every storage backend has to provide."""
 
-class TestInMemoryStorage:
-    def test_unknown_key(self):
-        in_memory_storage = InMemoryStorage()
-        cache = Cache(in_memory_storage)
+    @pytest.fixture(
+        params=[
+            "memory",
+            "disk",
+            pytest.param("redis", marks=pytest.mark.docker),
+        ]
+    )
+    def storage(self, request, tmp_path):
+        match request.param:
+            case "memory":
+                yield InMemoryStorage()
+            case "disk":
+                yield DiskStorage(str(tmp_path))
+            case "redis":
+                redis_client = request.getfixturevalue("redis_client")
+                yield RedisStorage(redis_client)
+                redis_client.flushdb()
+
+    @pytest.fixture(
+        params=[
+            "memory",
+            "disk",
+            pytest.param("redis", marks=pytest.mark.docker),
+        ]
+    )
+    def read_only_storage(self, request):
+        """
+        Like `storage`, but for tests that never store anything.
+
+        These tests cannot influence each other, so the disk backend is shared
+        across the session instead of getting a fresh directory per test.
+        """
+        match request.param:
+            case "memory":
+                return InMemoryStorage()
+            case "disk":
+                return request.getfixturevalue("shared_disk_storage")
+            case "redis":
+                return RedisStorage(request.getfixturevalue("redis_client"))
+
+    def test_unknown_key(self, read_only_storage):
+        cache = Cache(read_only_storage)
         assert cache.get("key") is None
 
-    def test_unknown_key_with_default(self):
-        in_memory_storage = InMemoryStorage()
-        cache = Cache(in_memory_storage)
+    def test_unknown_key_with_default(self, read_only_storage):
+        cache = Cache(read_only_storage)
         default = "default"
         cache_entry = cache.get("key", default=default)
         assert cache_entry is not None
@@ -279,9 +160,8 @@ class TestInMemoryStorage:
         assert cache_entry.added_at is None
         assert cache_entry.ttl is None
 
-    def test_cache_key_uniqueness(self):
-        in_memory_storage = InMemoryStorage()
-        cache = Cache(in_memory_storage)
+    def test_cache_key_uniqueness(self, storage):
+        cache = Cache(storage)
 
         cache.store("key", "value")
         cache.store("key", "updated-value")
@@ -295,14 +175,15 @@ class TestInMemoryStorage:
         assert cache_entry.ttl is None
         assert cache_entry.is_expired() is False
 
-    def test_basic_store_and_get(self):
-        in_memory_storage = InMemoryStorage()
-        cache = Cache(in_memory_storage)
+    def test_basic_store_and_get(self, storage):
+        cache = Cache(storage)
 
-        cache.store("key", "value")
+        stored_cache_entry = cache.store("key", "value")
         cache_entry = cache.get("key")
 
         assert cache_entry is not None
+        assert stored_cache_entry is not None
+        assert cache_entry == stored_cache_entry
         assert cache_entry.cache_key.key == "key"
         assert cache_entry.cache_key.package == __package__
         assert cache_entry.value == "value"
@@ -310,9 +191,8 @@ class TestInMemoryStorage:
         assert cache_entry.ttl is None
         assert cache_entry.is_expired() is False
 
-    def test_store_with_package(self):
-        in_memory_storage = InMemoryStorage()
-        cache = Cache(in_memory_storage)
+    def test_store_with_package(self, storage):
+        cache = Cache(storage)
 
         cache.store("key", "value", package="test")
         cache_entry = cache.get("key", package="test")
@@ -325,6 +205,326 @@ class TestInMemoryStorage:
         assert cache_entry.ttl is None
         assert cache_entry.is_expired() is False
 
+    def test_store_many_and_get_many(self, storage):
+        cache = Cache(storage)
+
+        stored_cache_entries = cache.store_many({"a": 1, "b": 2})
+        cache.store("expired", 3, ttl=timedelta(seconds=-1))
+
+        cache_entries = cache.get_many(["a", "missing", "b", "expired"])
+        assert cache_entries == [
+            stored_cache_entries[0],
+            None,
+            stored_cache_entries[1],
+            None,
+        ]
+        assert cache.get("b") == stored_cache_entries[1]
+        assert cache.get_many([]) == []
+
+    def test_memoize_without_key_or_key_generator(self, storage):
+        """Test that memoize raises ValueError when neither key nor key_generator is provided."""
+        cache = Cache(storage)
+
+        with pytest.raises(
+            ValueError,
+            match=re.escape("Either key or key_generator must be provided."),
+        ):
+
+            @cache.memoize()
+            def memoized_function(a):
+                return a
+
+    def test_memoize_with_both_key_and_key_generator(self, storage):
+        """Test that memoize raises ValueError when both key and key_generator are provided."""
+        cache = Cache(storage)
+
+        def key_generator(*_args, **_kwargs) -> str:
+            return "something"
+
+        with pytest.raises(
+            ValueError,
+            match=re.escape("Only one of key or key_generator can be provided."),
+        ):
+
+            @cache.memoize(key="something", key_generator=key_generator)
+            def memoized_function(a):
+                return a
+
+
+class TestDiskStorage:
+    @pytest.fixture(scope="class")
+    def disk_storage_directory(self, tmp_path_factory: pytest.TempPathFactory):
+        """A directory shared by the tests of this class."""
+        return tmp_path_factory.mktemp("disk-storage")
+
+    @pytest.fixture()
+    def disk_storage(self, disk_storage_directory, request) -> DiskStorage:
+        """
+        A `DiskStorage` in its own subdirectory of the class directory.
+
+        Every test gets an empty storage without creating and removing a
+        temporary directory per test.
+        """
+        return DiskStorage(str(disk_storage_directory / request.node.name))
+
+    def test_directory_handling(self, tmp_path):
+        disk_storage = DiskStorage(str(tmp_path / "nested" / "cache"))
+        assert disk_storage.directory.exists()
+        assert disk_storage.directory.is_dir()
+
+    def test_ttl_works(self, disk_storage):
+        cache = Cache(disk_storage)
+
+        cache.store("key", "value", ttl=timedelta(seconds=-1))
+        cache_entry_path = disk_storage._get_file_path(
+            CacheKey(key="key", package=cast(str, __package__))
+        )
+
+        assert cache_entry_path.exists()
+        assert cache.get("key") is None
+        assert not cache_entry_path.exists()
+
+    def test_return_expired(self, disk_storage):
+        cache = Cache(disk_storage)
+
+        cache.store("key", "value", ttl=timedelta(seconds=-1))
+        cache_entry_path = disk_storage._get_file_path(
+            CacheKey(key="key", package=cast(str, __package__))
+        )
+
+        assert cache_entry_path.exists()
+        cache_entry = cache.get("key", return_expired=True)
+        assert cache_entry is not None
+        assert cache_entry.cache_key.key == "key"
+        assert cache_entry.cache_key.package == __package__
+        assert cache_entry.value == "value"
+        assert cache_entry.added_at is not None
+        assert cache_entry.ttl == timedelta(seconds=-1)
+        assert cache_entry.is_expired() is True
+        assert not cache_entry_path.exists()
+
+    def test_expired_entry_is_not_unpickled(self, disk_storage, monkeypatch):
+        cache = Cache(disk_storage)
+
+        cache.store("key", "value", ttl=timedelta(seconds=-1))
+        cache_entry_path = disk_storage._get_file_path(
+            CacheKey(key="key", package=cast(str, __package__))
+        )
+
+        def fail_loads(*_args, **_kwargs):
+            raise AssertionError("expired entry must not be unpickled")
+
+        monkeypatch.setattr("watchpost.cache.pickle.loads", fail_loads)
+        assert cache.get("key") is None
+        assert not cache_entry_path.exists()
+
+    def test_ignores_entries_without_header(self, disk_storage):
+        cache = Cache(disk_storage)
+
+        cache_key = CacheKey(key="key", package=cast(str, __package__))
+        cache_entry = CacheEntry(
+            cache_key=cache_key,
+            value="value",
+            added_at=datetime.now(tz=UTC),
+            ttl=None,
+        )
+
+        # Files written before the header was introduced live in their own
+        # directory, which is left alone for code still reading it.
+        legacy_path = (
+            disk_storage.directory
+            / f"v{CacheEntry.VERSION}"
+            / disk_storage._get_file_path(cache_key).parent.name
+            / disk_storage._get_file_path(cache_key).name
+        )
+        legacy_path.parent.mkdir(parents=True)
+        legacy_path.write_bytes(pickle.dumps(cache_entry))
+        assert cache.get("key") is None
+        assert legacy_path.exists()
+
+        # A headerless file where headered ones are expected is discarded
+        # instead of being misread.
+        cache_entry_path = disk_storage._get_file_path(cache_key)
+        assert cache_entry_path.parent != legacy_path.parent
+        cache_entry_path.parent.mkdir(parents=True)
+        cache_entry_path.write_bytes(pickle.dumps(cache_entry))
+        assert cache.get("key", return_expired=True) is None
+        assert not cache_entry_path.exists()
+
+    def test_remove_expired(self, disk_storage):
+        cache = Cache(disk_storage)
+
+        cache.store("expired", "value", ttl=timedelta(seconds=-1))
+        cache.store("fresh", "value", ttl=timedelta(hours=1))
+        cache.store("forever", "value")
+
+        assert disk_storage.remove_expired() == 1
+        assert not disk_storage._get_file_path(
+            CacheKey(key="expired", package=cast(str, __package__))
+        ).exists()
+        assert cache.get("fresh") is not None
+        assert cache.get("forever") is not None
+        assert disk_storage.remove_expired() == 0
+
+    def test_remove_expired_sweeps_legacy_entries(self, disk_storage):
+        legacy_paths = {}
+        for key, ttl in (
+            ("expired", timedelta(seconds=-1)),
+            ("fresh", timedelta(hours=1)),
+        ):
+            cache_key = CacheKey(key=key, package=cast(str, __package__))
+            file_path = disk_storage._get_file_path(cache_key)
+            legacy_path = (
+                disk_storage.directory
+                / f"v{CacheEntry.VERSION}"
+                / file_path.parent.name
+                / file_path.name
+            )
+            legacy_path.parent.mkdir(parents=True)
+            legacy_path.write_bytes(
+                pickle.dumps(
+                    CacheEntry(
+                        cache_key=cache_key,
+                        value="value",
+                        added_at=datetime.now(tz=UTC),
+                        ttl=ttl,
+                    )
+                )
+            )
+            legacy_paths[key] = legacy_path
+
+        assert disk_storage.remove_expired() == 1
+        assert not legacy_paths["expired"].exists()
+        assert legacy_paths["fresh"].exists()
+        assert disk_storage.remove_expired() == 0
+
+    def test_async_store_and_get(self, disk_storage):
+        cache = Cache(disk_storage)
+
+        async def store_and_get():
+            await cache.store_async("key", "value")
+            return await cache.get_async("key")
+
+        cache_entry = asyncio.run(store_and_get())
+        assert cache_entry is not None
+        assert cache_entry.cache_key.package == __package__
+        assert cache_entry.value == "value"
+        # The entry is visible to the synchronous API as well
+        assert cache.get("key") == cache_entry
+
+    def test_failed_store_keeps_previous_entry(self, disk_storage):
+        cache = Cache(disk_storage)
+
+        cache.store("key", "value")
+        with pytest.raises((pickle.PicklingError, AttributeError)):
+            cache.store("key", lambda: None)
+
+        cache_entry = cache.get("key")
+        assert cache_entry is not None
+        assert cache_entry.value == "value"
+
+        # No temporary files are left behind
+        cache_key = CacheKey(key="key", package=cast(str, __package__))
+        shard_directory = disk_storage._get_file_path(cache_key).parent
+        assert [path.name for path in shard_directory.iterdir()] == [
+            disk_storage._get_file_path(cache_key).name
+        ]
+
+    def test_store_respects_umask(self, disk_storage):
+        cache = Cache(disk_storage)
+
+        previous_umask = os.umask(0o022)
+        try:
+            cache.store("key", "value")
+        finally:
+            os.umask(previous_umask)
+
+        cache_entry_path = disk_storage._get_file_path(
+            CacheKey(key="key", package=cast(str, __package__))
+        )
+        assert stat.S_IMODE(cache_entry_path.stat().st_mode) == 0o644
+
+    def test_memoize_with_key(self, disk_storage):
+        cache = Cache(disk_storage)
+
+        @cache.memoize(key="memoize-key")
+        def memoized_function(a):
+            return a
+
+        assert memoized_function(1) == 1
+        cache_key = CacheKey(
+            key="memoize-key",
+            package=cast(str, __package__),
+        )
+        cache_entry_path = disk_storage._get_file_path(cache_key)
+        assert cache_entry_path.exists()
+        # memoize currently does not cache by the arguments provided, so providing
+        # something else will still return the prior value while the cache is active
+        assert memoized_function(2) == 1
+
+        disk_storage._remove_file_on_disk(cache_entry_path)
+        assert memoized_function(2) == 2
+
+    def test_memoize_with_key_generator(self, disk_storage):
+        cache = Cache(disk_storage)
+
+        def key_generator(*args, **_kwargs) -> str:
+            return str(args[0])
+
+        counter = itertools.count()
+
+        @cache.memoize(key_generator=key_generator)
+        def memoized_function(_a):
+            return next(counter)
+
+        call_1 = memoized_function(1)
+        assert isinstance(call_1, int)
+        cache_key = CacheKey(
+            key="1",
+            package=cast(str, __package__),
+        )
+        cache_entry_path = disk_storage._get_file_path(cache_key)
+        assert cache_entry_path.exists()
+
+        # Repeat calls return the same result
+        assert memoized_function(1) == call_1
+        # Calls with a different argument return a different result
+        call_2 = memoized_function(2)
+        assert isinstance(call_2, int)
+        assert call_2 > call_1
+
+    def test_memoize_with_formattable_key(self, disk_storage):
+        """Test that memoize formats a key string using function arguments."""
+        cache = Cache(disk_storage)
+
+        counter = itertools.count()
+
+        @cache.memoize(key="user-{a}-{b}")
+        def memoized_function(a, b):
+            _ = a
+            _ = b
+            return next(counter)
+
+        # First call should store using formatted key
+        call_1 = memoized_function(1, 2)
+        assert isinstance(call_1, int)
+        cache_key = CacheKey(key="user-1-2", package=cast(str, __package__))
+        cache_entry_path = disk_storage._get_file_path(cache_key)
+        assert cache_entry_path.exists()
+
+        # Repeated call with same args returns cached value
+        assert memoized_function(1, 2) == call_1
+
+        # Calling with kwargs in different order should resolve to same key/value
+        assert memoized_function(b=2, a=1) == call_1
+
+        # Different arguments produce a different cache entry and value
+        call_2 = memoized_function(2, 2)
+        assert isinstance(call_2, int)
+        assert call_2 > call_1
+
+
+class TestInMemoryStorage:
     def test_ttl_works(self):
         in_memory_storage = InMemoryStorage()
         cache = Cache(in_memory_storage)
@@ -353,6 +553,99 @@ class TestInMemoryStorage:
         assert cache_entry.is_expired() is True
         assert cache_key not in in_memory_storage.cache
 
+    def test_max_entries_evicts_least_recently_stored(self):
+        in_memory_storage = InMemoryStorage(max_entries=2)
+        cache = Cache(in_memory_storage)
+
+        cache.store("a", 1)
+        cache.store("b", 2)
+        # Storing "a" again makes "b" the least recently stored entry
+        cache.store("a", 3)
+        cache.store("c", 4)
+
+        assert cache.get("b") is None
+        assert [entry.value for entry in in_memory_storage.cache.values()] == [3, 4]
+
+    def test_max_entries_must_be_positive(self):
+        with pytest.raises(ValueError):
+            InMemoryStorage(max_entries=0)
+
+    def test_expired_removal_keeps_replaced_entry(self):
+        """An expired entry replaced by another thread must not be removed."""
+        in_memory_storage = InMemoryStorage()
+        cache_key = CacheKey(key="key", package=cast(str, __package__))
+        expired = CacheEntry(
+            cache_key=cache_key,
+            value="old",
+            added_at=datetime.now(tz=UTC),
+            ttl=timedelta(seconds=-1),
+        )
+        fresh = CacheEntry(
+            cache_key=cache_key,
+            value="new",
+            added_at=datetime.now(tz=UTC),
+            ttl=None,
+        )
+        in_memory_storage.store(fresh)
+
+        in_memory_storage._remove_if_unchanged(cache_key, expired)
+        assert in_memory_storage.cache[cache_key] is fresh
+
+        # Removing an entry that is already gone is a no-op
+        del in_memory_storage.cache[cache_key]
+        in_memory_storage._remove_if_unchanged(cache_key, expired)
+        assert cache_key not in in_memory_storage.cache
+
+    def test_expired_removal_does_not_race_with_store(self):
+        """A store from another thread during removal must survive it."""
+        in_memory_storage = InMemoryStorage()
+        cache_key = CacheKey(key="key", package=cast(str, __package__))
+        expired = CacheEntry(
+            cache_key=cache_key,
+            value="old",
+            added_at=datetime.now(tz=UTC),
+            ttl=timedelta(seconds=-1),
+        )
+        fresh = CacheEntry(
+            cache_key=cache_key,
+            value="new",
+            added_at=datetime.now(tz=UTC),
+            ttl=None,
+        )
+        in_memory_storage.store(expired)
+
+        store_thread = threading.Thread(target=in_memory_storage.store, args=(fresh,))
+        store_waits_for_lock = threading.Event()
+        lock = in_memory_storage._lock
+
+        class SignallingLock:
+            def __enter__(self):
+                if threading.current_thread() is store_thread:
+                    store_waits_for_lock.set()
+                return lock.__enter__()
+
+            def __exit__(self, *exc_info):
+                return lock.__exit__(*exc_info)
+
+        class StoreDuringRemovalDict(dict):
+            def get(self, key, default=None):
+                value = super().get(key, default)
+                # Let another thread store while the removal has confirmed the
+                # entry is unchanged but not yet deleted it. The store has to
+                # wait for the removal to release the lock.
+                if store_thread.ident is None:
+                    store_thread.start()
+                    assert store_waits_for_lock.wait(timeout=5)
+                    assert lock.locked()
+                return value
+
+        in_memory_storage._lock = SignallingLock()
+        in_memory_storage.cache = StoreDuringRemovalDict(in_memory_storage.cache)
+        in_memory_storage._remove_if_unchanged(cache_key, expired)
+        store_thread.join()
+
+        assert in_memory_storage.cache[cache_key] is fresh
+
     def test_memoize(self):
         """Test that memoize works with a key."""
         in_memory_storage = InMemoryStorage()
@@ -375,6 +668,29 @@ class TestInMemoryStorage:
         del in_memory_storage.cache[cache_key]
         assert memoized_function(2) == 2
 
+    def test_memoize_with_key_applies_ttl_and_return_expired(self):
+        """Test that the static-key fast path honours ttl and return_expired."""
+        in_memory_storage = InMemoryStorage()
+        cache = Cache(in_memory_storage)
+
+        @cache.memoize(
+            key="memoize-key",
+            ttl=timedelta(seconds=-1),
+            return_expired=True,
+        )
+        def memoized_function(a):
+            return a
+
+        assert memoized_function(1) == 1
+        cache_key = CacheKey(
+            key="memoize-key",
+            package=cast(str, __package__),
+        )
+        assert in_memory_storage.cache[cache_key].ttl == timedelta(seconds=-1)
+        # The expired value is returned once, then recomputed
+        assert memoized_function(2) == 1
+        assert memoized_function(3) == 3
+
     def test_memoize_with_key_generator(self):
         """Test that memoize works with a key generator."""
         in_memory_storage = InMemoryStorage()
@@ -383,12 +699,14 @@ class TestInMemoryStorage:
         def key_generator(*args, **_kwargs) -> str:
             return str(args[0])
 
+        counter = itertools.count()
+
         @cache.memoize(key_generator=key_generator)
         def memoized_function(_a):
-            return datetime.now(tz=UTC)
+            return next(counter)
 
         call_1 = memoized_function(1)
-        assert isinstance(call_1, datetime)
+        assert isinstance(call_1, int)
         cache_key = CacheKey(
             key="1",
             package=cast(str, __package__),
@@ -400,53 +718,24 @@ class TestInMemoryStorage:
 
         # Calls with a different argument return a different result
         call_2 = memoized_function(2)
-        assert isinstance(call_2, datetime)
+        assert isinstance(call_2, int)
         assert call_2 > call_1
 
-    def test_memoize_without_key_or_key_generator(self):
-        """Test that memoize raises ValueError when neither key nor key_generator is provided."""
-        in_memory_storage = InMemoryStorage()
-        cache = Cache(in_memory_storage)
-
-        with pytest.raises(
-            ValueError,
-            match=re.escape("Either key or key_generator must be provided."),
-        ):
-
-            @cache.memoize()
-            def memoized_function(a):
-                return a
-
-    def test_memoize_with_both_key_and_key_generator(self):
-        """Test that memoize raises ValueError when both key and key_generator are provided."""
-        in_memory_storage = InMemoryStorage()
-        cache = Cache(in_memory_storage)
-
-        def key_generator(*_args, **_kwargs) -> str:
-            return "something"
-
-        with pytest.raises(
-            ValueError,
-            match=re.escape("Only one of key or key_generator can be provided."),
-        ):
-
-            @cache.memoize(key="something", key_generator=key_generator)
-            def memoized_function(a):
-                return a
-
     def test_memoize_with_formattable_key(self):
         """Test that memoize formats a key string using function arguments (in-memory)."""
         in_memory_storage = InMemoryStorage()
         cache = Cache(in_memory_storage)
 
+        counter = itertools.count()
+
         @cache.memoize(key="user-{a}-{b}")
         def memoized_function(a, b):
             _ = a
             _ = b
-            return datetime.now(tz=UTC)
+            return next(counter)
 
         call_1 = memoized_function(1, 2)
-        assert isinstance(call_1, datetime)
+        assert isinstance(call_1, int)
         cache_key = CacheKey(key="user-1-2", package=cast(str, __package__))
         assert cache_key in in_memory_storage.cache
 
@@ -457,9 +746,24 @@ class TestInMemoryStorage:
 
         # Different args -> new cache entry/value
         call_2 = memoized_function(2, 2)
-        assert isinstance(call_2, datetime)
+        assert isinstance(call_2, int)
         assert call_2 > call_1
 
+    def test_memoize_with_formattable_key_resolves_signature_once(self, monkeypatch):
+        """The function signature is inspected when decorating, not per call."""
+        cache = Cache(InMemoryStorage())
+
+        @cache.memoize(key="user-{a}")
+        def memoized_function(a):
+            return a
+
+        def fail_signature(*_args, **_kwargs):
+            raise AssertionError("signature inspected on call")
+
+        monkeypatch.setattr("watchpost.cache.inspect.signature", fail_signature)
+        assert memoized_function(1) == 1
+        assert memoized_function(a=2) == 2
+
 
 class TestChainedStorage:
     def test_constructor_requires_at_least_one_storage(self):
@@ -611,101 +915,64 @@ class TestChainedStorage:
         assert result.is_expired() is True
 
 
-@pytest.fixture(scope="class")
-def redis_container():
-    """
-    Fixture that provides a Redis container for testing.
-
-    This fixture is scoped to the class level, so the same container
-    is used for all tests in a class.
-    """
-    with RedisContainer() as container:
-        yield container
-
+class TestRedisKey:
+    def test_redis_key_is_memoized(self):
+        # Deriving keys never talks to Redis, so no server is needed.
+        redis_storage = RedisStorage(cast(redis.Redis, None))
+        cache_key = CacheKey(key="key", package=cast(str, __package__))
 
-@pytest.fixture(scope="class")
-def redis_client(redis_container):
-    """
-    Fixture that provides a Redis client connected to the Redis container.
+        redis_key = redis_storage._get_redis_key(cache_key)
+        assert redis_storage._get_redis_key(cache_key) == redis_key
+        assert redis_storage._cached_redis_key.cache_info().hits == 1
 
-    This fixture depends on the redis_container fixture.
-    """
-    client = redis.Redis(
-        host=redis_container.get_container_host_ip(),
-        port=redis_container.get_exposed_port(6379),
-        decode_responses=False,
+        # The memoization is per storage, so infixes are kept apart
+        infixed_redis_storage = RedisStorage(
+            cast(redis.Redis, None), redis_key_infix="infix"
+        )
+        assert infixed_redis_storage._get_redis_key(cache_key) != redis_key
+
+    @pytest.mark.parametrize(
+        ("first_key", "second_key"),
+        [
+            pytest.param(1, True, id="int-bool"),
+            pytest.param(1, 1.0, id="int-float"),
+            pytest.param((1,), (True,), id="nested"),
+        ],
     )
-    yield client
+    def test_redis_key_does_not_depend_on_lookup_order(self, first_key, second_key):
+        # Equal keys of different types share a hash, but not a Redis key.
+        package = cast(str, __package__)
+        redis_storage = RedisStorage(cast(redis.Redis, None))
+        redis_storage._get_redis_key(CacheKey(key=first_key, package=package))
+
+        fresh_redis_storage = RedisStorage(cast(redis.Redis, None))
+        assert redis_storage._get_redis_key(
+            CacheKey(key=second_key, package=package)
+        ) == fresh_redis_storage._get_redis_key(
+            CacheKey(key=second_key, package=package)
+        )
 
 
 @pytest.mark.docker
 class TestRedisStorage:
-    def test_unknown_key(self, redis_client):
-        redis_storage = RedisStorage(redis_client)
-        cache = Cache(redis_storage)
-        assert cache.get("key") is None
-
-    def test_unknown_key_with_default(self, redis_client):
-        redis_storage = RedisStorage(redis_client)
-        cache = Cache(redis_storage)
-        default = "default"
-        cache_entry = cache.get("key", default=default)
-        assert cache_entry is not None
-        assert cache_entry.cache_key.key == "key"
-        assert cache_entry.cache_key.package == __package__
-        assert cache_entry.value == default
-        assert cache_entry.added_at is None
-        assert cache_entry.ttl is None
-
-    def test_cache_key_uniqueness(self, redis_client):
-        redis_storage = RedisStorage(redis_client)
-        cache = Cache(redis_storage)
-
-        cache.store("key", "value")
-        cache.store("key", "updated-value")
-        cache_entry = cache.get("key")
-
-        assert cache_entry is not None
-        assert cache_entry.cache_key.key == "key"
-        assert cache_entry.cache_key.package == __package__
-        assert cache_entry.value == "updated-value"
-        assert cache_entry.added_at is not None
-        assert cache_entry.ttl is None
-        assert cache_entry.is_expired() is False
-
-    def test_basic_store_and_get(self, redis_client):
-        redis_storage = RedisStorage(redis_client)
-        cache = Cache(redis_storage)
-
-        cache.store("key", "value")
-        cache_entry = cache.get("key")
-
-        assert cache_entry is not None
-        assert cache_entry.cache_key.key == "key"
-        assert cache_entry.cache_key.package == __package__
-        assert cache_entry.value == "value"
-        assert cache_entry.added_at is not None
-        assert cache_entry.ttl is None
-        assert cache_entry.is_expired() is False
-
-    def test_store_with_package(self, redis_client):
-        redis_storage = RedisStorage(redis_client)
-        cache = Cache(redis_storage)
-
-        cache.store("key", "value", package="test")
-        cache_entry = cache.get("key", package="test")
-
-        assert cache_entry is not None
-        assert cache_entry.cache_key.key == "key"
-        assert cache_entry.cache_key.package == "test"
-        assert cache_entry.value == "value"
-        assert cache_entry.added_at is not None
-        assert cache_entry.ttl is None
-        assert cache_entry.is_expired() is False
-
-    def test_ttl_works_with_redis_ttl_true(self, redis_client):
+    @pytest.fixture(autouse=True)
+    def _flush_redis(self, redis_client):
+        """Isolate the tests from each other, as they share one Redis server."""
+        yield
+        redis_client.flushdb()
+
+    @pytest.fixture(scope="class")
+    def redis_storage(self, redis_client):
+        """A `RedisStorage` relying on Redis key expiry (the default)."""
+        return RedisStorage(redis_client)
+
+    @pytest.fixture(scope="class")
+    def redis_storage_without_redis_ttl(self, redis_client):
+        """A `RedisStorage` that checks expiry in Python instead of Redis."""
+        return RedisStorage(redis_client, use_redis_ttl=False)
+
+    def test_ttl_works_with_redis_ttl_true(self, redis_client, redis_storage):
         """Test that with use_redis_ttl=True (default), expired entries are deleted from Redis."""
-        redis_storage = RedisStorage(redis_client, use_redis_ttl=True)
         cache = Cache(redis_storage)
 
         cache.store("key", "value", ttl=timedelta(seconds=-1))
@@ -719,14 +986,15 @@ class TestRedisStorage:
         # And get() should return None because it's expired
         assert cache.get("key") is None
 
-    def test_ttl_works_with_redis_ttl_false(self, redis_client):
+    def test_ttl_works_with_redis_ttl_false(
+        self, redis_client, redis_storage_without_redis_ttl
+    ):
         """Test that with use_redis_ttl=False, expired entries are still stored in Redis."""
-        redis_storage = RedisStorage(redis_client, use_redis_ttl=False)
-        cache = Cache(redis_storage)
+        cache = Cache(redis_storage_without_redis_ttl)
 
         cache.store("key", "value", ttl=timedelta(seconds=-1))
         cache_key = CacheKey(key="key", package=cast(str, __package__))
-        redis_key = redis_storage._get_redis_key(cache_key)
+        redis_key = redis_storage_without_redis_ttl._get_redis_key(cache_key)
 
         # The key should exist in Redis even though it's expired
         assert redis_client.exists(redis_key) == 1
@@ -737,14 +1005,13 @@ class TestRedisStorage:
         # And the key should be removed from Redis after the get() call
         assert redis_client.exists(redis_key) == 0
 
-    def test_return_expired(self, redis_client):
+    def test_return_expired(self, redis_client, redis_storage_without_redis_ttl):
         """Test that expired entries can be returned with return_expired=True."""
-        redis_storage = RedisStorage(redis_client, use_redis_ttl=False)
-        cache = Cache(redis_storage)
+        cache = Cache(redis_storage_without_redis_ttl)
 
         cache.store("key", "value", ttl=timedelta(seconds=-1))
         cache_key = CacheKey(key="key", package=cast(str, __package__))
-        redis_key = redis_storage._get_redis_key(cache_key)
+        redis_key = redis_storage_without_redis_ttl._get_redis_key(cache_key)
 
         # The key should exist in Redis
         assert redis_client.exists(redis_key) == 1
@@ -762,9 +1029,8 @@ class TestRedisStorage:
         # And the key should be removed from Redis
         assert redis_client.exists(redis_key) == 0
 
-    def test_positive_ttl_with_redis_ttl_true(self, redis_client):
+    def test_positive_ttl_with_redis_ttl_true(self, redis_client, redis_storage):
         """Test that with use_redis_ttl=True and a positive TTL, Redis's TTL mechanism is used."""
-        redis_storage = RedisStorage(redis_client, use_redis_ttl=True)
         cache = Cache(redis_storage)
 
         # Store with a positive TTL (1 hour)
@@ -784,15 +1050,16 @@ class TestRedisStorage:
         assert cache_entry is not None
         assert cache_entry.value == "value"
 
-    def test_positive_ttl_with_redis_ttl_false(self, redis_client):
+    def test_positive_ttl_with_redis_ttl_false(
+        self, redis_client, redis_storage_without_redis_ttl
+    ):
         """Test that with use_redis_ttl=False and a positive TTL, Python's TTL mechanism is used."""
-        redis_storage = RedisStorage(redis_client, use_redis_ttl=False)
-        cache = Cache(redis_storage)
+        cache = Cache(redis_storage_without_redis_ttl)
 
         # Store with a positive TTL (1 hour)
         cache.store("key", "value", ttl=timedelta(hours=1))
         cache_key = CacheKey(key="key", package=cast(str, __package__))
-        redis_key = redis_storage._get_redis_key(cache_key)
+        redis_key = redis_storage_without_redis_ttl._get_redis_key(cache_key)
 
         # The key should exist in Redis
         assert redis_client.exists(redis_key) == 1
@@ -859,8 +1126,7 @@ class TestRedisStorage:
         assert redis_key1 != redis_key2
 
         # Both keys should exist in Redis
-        assert redis_client.exists(redis_key1) == 1
-        assert redis_client.exists(redis_key2) == 1
+        assert redis_client.exists(redis_key1, redis_key2) == 2
 
         # We should get different values from each cache
         cache_entry1 = cache1.get("same-key")
@@ -871,9 +1137,8 @@ class TestRedisStorage:
         assert cache_entry1.value == "value1"
         assert cache_entry2.value == "value2"
 
-    def test_memoize(self, redis_client):
+    def test_memoize(self, redis_client, redis_storage):
         """Test that memoize works with a key."""
-        redis_storage = RedisStorage(redis_client)
         cache = Cache(redis_storage)
 
         @cache.memoize(key="memoize-key")
@@ -895,23 +1160,24 @@ class TestRedisStorage:
         assert memoized_function(2) == 1
 
         # Delete the key from Redis
-        redis_client.delete(redis_key)
+        redis_client.unlink(redis_key)
         assert memoized_function(2) == 2
 
-    def test_memoize_with_key_generator(self, redis_client):
+    def test_memoize_with_key_generator(self, redis_client, redis_storage):
         """Test that memoize works with a key generator."""
-        redis_storage = RedisStorage(redis_client)
         cache = Cache(redis_storage)
 
         def key_generator(*args, **_kwargs) -> str:
             return str(args[0])
 
+        counter = itertools.count()
+
         @cache.memoize(key_generator=key_generator)
         def memoized_function(_a):
-            return datetime.now(tz=UTC)
+            return next(counter)
 
         call_1 = memoized_function(1)
-        assert isinstance(call_1, datetime)
+        assert isinstance(call_1, int)
         cache_key = CacheKey(
             key="1",
             package=cast(str, __package__),
@@ -926,53 +1192,23 @@ class TestRedisStorage:
 
         # Calls with a different argument return a different result
         call_2 = memoized_function(2)
-        assert isinstance(call_2, datetime)
+        assert isinstance(call_2, int)
         assert call_2 > call_1
 
-    def test_memoize_without_key_or_key_generator(self, redis_client):
-        """Test that memoize raises ValueError when neither key nor key_generator is provided."""
-        redis_storage = RedisStorage(redis_client)
-        cache = Cache(redis_storage)
-
-        with pytest.raises(
-            ValueError,
-            match=re.escape("Either key or key_generator must be provided."),
-        ):
-
-            @cache.memoize()
-            def memoized_function(a):
-                return a
-
-    def test_memoize_with_both_key_and_key_generator(self, redis_client):
-        """Test that memoize raises ValueError when both key and key_generator are provided."""
-        redis_storage = RedisStorage(redis_client)
-        cache = Cache(redis_storage)
-
-        def key_generator(*_args, **_kwargs) -> str:
-            return "something"
-
-        with pytest.raises(
-            ValueError,
-            match=re.escape("Only one of key or key_generator can be provided."),
-        ):
-
-            @cache.memoize(key="something", key_generator=key_generator)
-            def memoized_function(a):
-                return a
-
-    def test_memoize_with_formattable_key(self, redis_client):
+    def test_memoize_with_formattable_key(self, redis_client, redis_storage):
         """Test that memoize formats a key string using function arguments (Redis)."""
-        redis_storage = RedisStorage(redis_client)
         cache = Cache(redis_storage)
 
+        counter = itertools.count()
+
         @cache.memoize(key="user-{a}-{b}")
         def memoized_function(a, b):
             _ = a
             _ = b
-            return datetime.now(tz=UTC)
+            return next(counter)
 
         call_1 = memoized_function(1, 2)
-        assert isinstance(call_1, datetime)
+        assert isinstance(call_1, int)
         cache_key = CacheKey(key="user-1-2", package=cast(str, __package__))
         redis_key = redis_storage._get_redis_key(cache_key)
         assert redis_client.exists(redis_key) == 1
@@ -984,5 +1220,5 @@ class TestRedisStorage:
 
         # Different args -> new cache entry/value
         call_2 = memoized_function(2, 2)
-        assert isinstance(call_2, datetime)
+        assert isinstance(call_2, int)
         assert call_2 > call_1
@@ -14,8 +14,12 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
+import sys
 from unittest.mock import MagicMock
 
+import pytest
+
 from watchpost.app import Watchpost
 from watchpost.check import Check, check
 from watchpost.datasource import Datasource
@@ -25,12 +29,21 @@ from watchpost.utils import InvocationInformation
 
 from .utils import decode_checkmk_output
 
+SERVICE_LABELS = {"env": "test"}
 TEST_ENVIRONMENT = Environment("test_env")
+MULTIPLE_ENVIRONMENTS = [Environment("env1"), Environment("env2"), Environment("env3")]
 WATCHPOST = MagicMock(spec=Watchpost)
 WATCHPOST.hostname_strategy = None
 WATCHPOST.hostname_fallback_to_default_hostname_generation = True
 WATCHPOST.hostname_coerce_into_valid_hostname = True
 
+RESULT_TYPES = [
+    pytest.param(ok, CheckState.OK, "Everything is fine", id="ok"),
+    pytest.param(warn, CheckState.WARN, "Something might be wrong", id="warn"),
+    pytest.param(crit, CheckState.CRIT, "Something is wrong", id="crit"),
+    pytest.param(unknown, CheckState.UNKNOWN, "Status is unknown", id="unknown"),
+]
+
 
 class TestDatasource(Datasource):
     pass
@@ -40,7 +53,67 @@ class AnotherTestDatasource(Datasource):
     pass
 
 
-def test_check_initialization():
+@pytest.fixture(scope="module")
+def make_check():
+    """
+    Build a `Check` with the defaults shared by the tests in this module.
+
+    Tests only pass the arguments they actually care about.
+    """
+
+    return functools.partial(
+        Check,
+        service_name="test_service",
+        service_labels=SERVICE_LABELS,
+        environments=[TEST_ENVIRONMENT],
+        cache_for=None,
+    )
+
+
+@pytest.fixture(params=["direct", "decorator"])
+def build_check(request, make_check):
+    """
+    Build a `Check` either directly or through the `@check` decorator.
+
+    Tests using this fixture run once for each way of defining a check, so the
+    behavior of both is covered by a single test.
+    """
+
+    def build(check_function, *, environments=None):
+        environments = environments or [TEST_ENVIRONMENT]
+        if request.param == "direct":
+            return make_check(check_function=check_function, environments=environments)
+        return check(
+            name="test_service",
+            service_labels=SERVICE_LABELS,
+            environments=environments,
+            cache_for=None,
+        )(check_function)
+
+    return build
+
+
+@pytest.fixture(scope="module")
+def datasources():
+    """
+    Instantiate the datasources once for all tests in this module.
+
+    Checks only read from the datasources they are given, so the instances can
+    be shared safely.
+    """
+
+    return {"test_datasource": TestDatasource()}
+
+
+@pytest.fixture(scope="module")
+def multiple_datasources(datasources):
+    return {
+        **datasources,
+        "another_datasource": AnotherTestDatasource(),
+    }
+
+
+def test_check_initialization(make_check):
     """Test that a Check object can be properly initialized."""
 
     # Create a simple check function
@@ -49,24 +122,19 @@ def test_check_initialization():
         return ok("Test passed")
 
     # Initialize the Check object
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
+    check = make_check(check_function=check_func)
 
     # Verify the Check object was initialized correctly
     assert check.check_function == check_func
     assert check.service_name == "test_service"
-    assert check.service_labels == {"env": "test"}
+    assert check.service_labels is SERVICE_LABELS
     assert len(check.environments) == 1
     assert check.environments[0].name == "test_env"
+    assert check.environments_frozenset == frozenset(check.environments)
     assert check.invocation_information is None
 
 
-def test_check_with_invocation_information():
+def test_check_with_invocation_information(make_check):
     """Test that a Check object can be initialized with invocation information."""
 
     def check_func(test_datasource: TestDatasource):
@@ -75,13 +143,9 @@ def test_check_with_invocation_information():
 
     invocation_info = InvocationInformation(relative_path="test/path", line_number=42)
 
-    check = Check(
+    check = make_check(
         check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
         invocation_information=invocation_info,
-        cache_for=None,
     )
 
     assert check.invocation_information
@@ -90,170 +154,64 @@ def test_check_with_invocation_information():
     assert check.invocation_information.line_number == 42
 
 
-def test_generate_hostname():
+def test_generate_hostname(make_check, datasources):
     """Test default hostname resolution via fallback when no strategies are set."""
 
     def check_func(test_datasource: TestDatasource):
         _ = test_datasource
         return ok("Test passed")
 
-    check = Check(
+    check = make_check(
         check_function=check_func,
-        service_name="test_service",
         service_labels={},
         environments=[],
-        cache_for=None,
     )
 
-    env = Environment("test_env")
     results = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={"test_datasource": TestDatasource()},
-        environment=env,
+        datasources=datasources,
+        environment=TEST_ENVIRONMENT,
     )
 
     # Verify the hostname format uses default fallback
     assert results[0].piggyback_host == "test-service-test-env"
 
 
-def test_run_with_ok_result():
-    """Test the run method with a check function that returns an OK result."""
+@pytest.mark.parametrize(("result_builder", "check_state", "summary"), RESULT_TYPES)
+def test_run_with_result(
+    build_check, datasources, result_builder, check_state, summary
+):
+    """Test the run method with a check function that returns each result type."""
 
-    # Create a check function that returns an OK result
+    # Create a check function that returns the parametrized result
     def check_func(test_datasource: TestDatasource):
         _ = test_datasource
-        return ok("Everything is fine")
+        return result_builder(summary)
 
     # Initialize the Check object
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
+    check = build_check(check_func)
 
     # Run the check
     results = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=TEST_ENVIRONMENT,
     )
 
     # Verify the results
     assert len(results) == 1
-    assert results[0].check_state == CheckState.OK
-    assert results[0].summary == "Everything is fine"
+    assert results[0].check_state is check_state
+    assert results[0].summary == summary
     assert results[0].service_name == "test_service"
     assert results[0].environment_name == "test_env"
     assert results[0].service_labels == {"env": "test"}
     assert results[0].piggyback_host == "test-service-test-env"
 
 
-def test_run_with_critical_result():
-    """Test the run method with a check function that returns a CRIT result."""
-
-    # Create a check function that returns a CRIT result
-    def check_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return crit("Something is wrong")
-
-    # Initialize the Check object
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-
-    # Run the check
-    results = check.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the results
-    assert len(results) == 1
-    assert results[0].check_state == CheckState.CRIT
-    assert results[0].summary == "Something is wrong"
-
-
-def test_run_with_warning_result():
-    """Test the run method with a check function that returns a WARN result."""
-
-    # Create a check function that returns a WARN result
-    def check_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return warn("Something might be wrong")
-
-    # Initialize the Check object
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-
-    # Run the check
-    results = check.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the results
-    assert len(results) == 1
-    assert results[0].check_state == CheckState.WARN
-    assert results[0].summary == "Something might be wrong"
-
-
-def test_run_with_unknown_result():
-    """Test the run method with a check function that returns an UNKNOWN result."""
-
-    # Create a check function that returns an UNKNOWN result
-    def check_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return unknown("Status is unknown")
-
-    # Initialize the Check object
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-
-    # Run the check
-    results = check.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the results
-    assert len(results) == 1
-    assert results[0].check_state == CheckState.UNKNOWN
-    assert results[0].summary == "Status is unknown"
-
-
-def test_run_with_multiple_environments():
+def test_run_with_multiple_environments(build_check, datasources):
     """Test the run method with multiple environments."""
 
-    env1 = Environment("env1")
-    env2 = Environment("env2")
-    env3 = Environment("env3")
+    env1, env2, env3 = MULTIPLE_ENVIRONMENTS
 
     # Create a check function
     def check_func(environment: Environment, test_datasource: TestDatasource):
@@ -261,19 +219,11 @@ def test_run_with_multiple_environments():
         return ok(f"Checked environment {environment.name}")
 
     # Initialize the Check object with multiple environments
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[env1, env2, env3],
-        cache_for=None,
-    )
+    check = build_check(check_func, environments=MULTIPLE_ENVIRONMENTS)
 
     results1 = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=env1,
     )
     assert len(results1) == 1
@@ -282,9 +232,7 @@ def test_run_with_multiple_environments():
 
     results2 = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=env2,
     )
     assert len(results2) == 1
@@ -293,9 +241,7 @@ def test_run_with_multiple_environments():
 
     results3 = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=env3,
     )
     assert len(results3) == 1
@@ -303,7 +249,7 @@ def test_run_with_multiple_environments():
     assert results3[0].summary == "Checked environment env3"
 
 
-def test_run_with_multiple_datasources():
+def test_run_with_multiple_datasources(build_check, multiple_datasources):
     """Test the run method with multiple datasources."""
 
     # Create a check function that uses multiple datasources
@@ -316,31 +262,22 @@ def test_run_with_multiple_datasources():
         return ok("Multiple datasources used")
 
     # Initialize the Check object with multiple datasources
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
+    check = build_check(check_func)
 
     # Run the check
     results = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-            "another_datasource": AnotherTestDatasource(),
-        },
+        datasources=multiple_datasources,
         environment=TEST_ENVIRONMENT,
     )
 
     # Verify the results
     assert len(results) == 1
-    assert results[0].check_state == CheckState.OK
+    assert results[0].check_state is CheckState.OK
     assert results[0].summary == "Multiple datasources used"
 
 
-def test_run_with_environment_parameter():
+def test_run_with_environment_parameter(build_check, datasources):
     """Test the run method with a check function that takes an environment parameter."""
 
     # Create a check function that takes an environment parameter
@@ -349,61 +286,43 @@ def test_run_with_environment_parameter():
         return ok(f"Checked environment: {environment.name}")
 
     # Initialize the Check object
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
+    check = build_check(check_func)
 
     # Run the check
     results = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=TEST_ENVIRONMENT,
     )
 
     # Verify the results
     assert len(results) == 1
-    assert results[0].check_state == CheckState.OK
+    assert results[0].check_state is CheckState.OK
     assert results[0].summary == "Checked environment: test_env"
 
 
-def test_run_captures_stdout_stderr():
+def test_run_captures_stdout_stderr(build_check, datasources):
     """Test that the run method captures stdout and stderr."""
 
     # Create a check function that prints to stdout and stderr
     def check_func(test_datasource: TestDatasource):
         _ = test_datasource
         print("This is printed to stdout")  # noqa: T201
-        import sys
-
         print("This is printed to stderr", file=sys.stderr)  # noqa: T201
         return ok("Check completed")
 
     # Initialize the Check object
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
+    check = build_check(check_func)
 
     results = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=TEST_ENVIRONMENT,
     )
 
     # Verify the results
     assert len(results) == 1
-    assert results[0].check_state == CheckState.OK
+    assert results[0].check_state is CheckState.OK
     assert results[0].summary == "Check completed"
     assert (
         results[0].details
@@ -411,7 +330,7 @@ def test_run_captures_stdout_stderr():
     )
 
 
-def test_run_with_list_of_results():
+def test_run_with_list_of_results(build_check, datasources):
     """Test the run method with a check function that returns a list of results."""
 
     # Create a check function that returns a list of results
@@ -424,34 +343,27 @@ def test_run_with_list_of_results():
         ]
 
     # Initialize the Check object
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
+    check = build_check(check_func)
 
     # Run the check
     results = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=TEST_ENVIRONMENT,
     )
 
     # Verify the results
     assert len(results) == 3
-    assert results[0].check_state == CheckState.OK
-    assert results[0].summary == "First check passed"
-    assert results[1].check_state == CheckState.WARN
-    assert results[1].summary == "Second check has a warning"
-    assert results[2].check_state == CheckState.CRIT
-    assert results[2].summary == "Third check failed"
+    first, second, third = results
+    assert first.check_state is CheckState.OK
+    assert first.summary == "First check passed"
+    assert second.check_state is CheckState.WARN
+    assert second.summary == "Second check has a warning"
+    assert third.check_state is CheckState.CRIT
+    assert third.summary == "Third check failed"
 
 
-def test_run_with_generator_of_results():
+def test_run_with_generator_of_results(build_check, datasources):
     """Test the run method with a check function that returns a generator of results."""
 
     # Create a check function that returns a generator of results
@@ -462,492 +374,105 @@ def test_run_with_generator_of_results():
         yield crit("Third check failed")
 
     # Initialize the Check object
-    check = Check(
-        check_function=check_func,
-        service_name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
+    check = build_check(check_func)
 
     # Run the check
     results = check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=TEST_ENVIRONMENT,
     )
 
     # Verify the results
     assert len(results) == 3
-    assert results[0].check_state == CheckState.OK
-    assert results[0].summary == "First check passed"
-    assert results[1].check_state == CheckState.WARN
-    assert results[1].summary == "Second check has a warning"
-    assert results[2].check_state == CheckState.CRIT
-    assert results[2].summary == "Third check failed"
+    first, second, third = results
+    assert first.check_state is CheckState.OK
+    assert first.summary == "First check passed"
+    assert second.check_state is CheckState.WARN
+    assert second.summary == "Second check has a warning"
+    assert third.check_state is CheckState.CRIT
+    assert third.summary == "Third check failed"
 
 
 # Tests for the check decorator
 
 
+# Decorated once at import time and shared by the tests that only inspect or
+# run it without modification.
+@check(
+    name="test_service",
+    service_labels=SERVICE_LABELS,
+    environments=[TEST_ENVIRONMENT],
+    cache_for=None,
+)
+def decorated_check(test_datasource: TestDatasource):
+    _ = test_datasource
+    return ok("Test passed")
+
+
 def test_check_decorator_returns_check_instance():
     """Test that the check decorator returns a Check instance."""
 
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def decorated_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return ok("Test passed")
-
     # Verify that the decorated function is a Check instance
-    assert isinstance(decorated_func, Check)
-    assert decorated_func.service_name == "test_service"
-    assert decorated_func.service_labels == {"env": "test"}
-    assert len(decorated_func.environments) == 1
-    assert decorated_func.environments[0].name == "test_env"
-
-
-def test_decorated_function_run_method():
-    """Test the run method of a decorated function."""
-
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def decorated_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return ok("Test passed")
-
-    # Run the check
-    results = decorated_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the results
-    assert len(results) == 1
-    assert results[0].check_state == CheckState.OK
-    assert results[0].summary == "Test passed"
-    assert results[0].service_name == "test_service"
-    assert results[0].environment_name == "test_env"
-    assert results[0].service_labels == {"env": "test"}
-    assert results[0].piggyback_host == "test-service-test-env"
-
-
-def test_decorated_function_with_different_result_types():
-    """Test decorated functions with different result types."""
-
-    # Test with OK result
-    @check(
-        name="ok_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def ok_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return ok("Everything is fine")
-
-    # Test with WARN result
-    @check(
-        name="warn_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def warn_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return warn("Something might be wrong")
-
-    # Test with CRIT result
-    @check(
-        name="crit_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def crit_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return crit("Something is wrong")
-
-    # Test with UNKNOWN result
-    @check(
-        name="unknown_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def unknown_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return unknown("Status is unknown")
-
-    # Run the checks
-    ok_results = ok_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-    warn_results = warn_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-    crit_results = crit_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-    unknown_results = unknown_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the OK results
-    assert len(ok_results) == 1
-    assert ok_results[0].check_state == CheckState.OK
-    assert ok_results[0].summary == "Everything is fine"
-
-    # Verify the WARN results
-    assert len(warn_results) == 1
-    assert warn_results[0].check_state == CheckState.WARN
-    assert warn_results[0].summary == "Something might be wrong"
-
-    # Verify the CRIT results
-    assert len(crit_results) == 1
-    assert crit_results[0].check_state == CheckState.CRIT
-    assert crit_results[0].summary == "Something is wrong"
-
-    # Verify the UNKNOWN results
-    assert len(unknown_results) == 1
-    assert unknown_results[0].check_state == CheckState.UNKNOWN
-    assert unknown_results[0].summary == "Status is unknown"
-
-
-def test_decorated_function_with_multiple_environments():
-    """Test a decorated function with multiple environments."""
-
-    env1 = Environment("env1")
-    env2 = Environment("env2")
-    env3 = Environment("env3")
-
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[env1, env2, env3],
-        cache_for=None,
-    )
-    def decorated_func(environment: Environment, test_datasource: TestDatasource):
-        _ = test_datasource
-        return ok(f"Checked environment {environment.name}")
-
-    results1 = decorated_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=env1,
-    )
-    assert len(results1) == 1
-    assert results1[0].environment_name == "env1"
-    assert results1[0].summary == "Checked environment env1"
-
-    results2 = decorated_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=env2,
-    )
-    assert len(results2) == 1
-    assert results2[0].environment_name == "env2"
-    assert results2[0].summary == "Checked environment env2"
-
-    results3 = decorated_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=env3,
-    )
-    assert len(results3) == 1
-    assert results3[0].environment_name == "env3"
-    assert results3[0].summary == "Checked environment env3"
-
-
-def test_decorated_function_with_multiple_datasources():
-    """Test a decorated function with multiple datasources."""
-
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def decorated_func(
-        test_datasource: TestDatasource,
-        another_datasource: AnotherTestDatasource,
-    ):
-        _ = test_datasource
-        _ = another_datasource
-        return ok("Multiple datasources used")
-
-    # Run the check
-    results = decorated_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-            "another_datasource": AnotherTestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the results
-    assert len(results) == 1
-    assert results[0].check_state == CheckState.OK
-    assert results[0].summary == "Multiple datasources used"
-
-
-def test_decorated_function_with_environment_parameter():
-    """Test a decorated function with an environment parameter."""
-
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def decorated_func(environment: Environment, test_datasource: TestDatasource):
-        _ = test_datasource
-        return ok(f"Checked environment: {environment.name}")
-
-    # Run the check
-    results = decorated_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the results
-    assert len(results) == 1
-    assert results[0].check_state == CheckState.OK
-    assert results[0].summary == "Checked environment: test_env"
-
-
-def test_decorated_function_captures_stdout_stderr():
-    """Test that a decorated function captures stdout and stderr."""
-
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def decorated_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        print("This is printed to stdout")  # noqa: T201
-        import sys
-
-        print("This is printed to stderr", file=sys.stderr)  # noqa: T201
-        return ok("Check completed")
-
-    # Run the check
-    results = decorated_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the results
-    assert len(results) == 1
-    assert results[0].check_state == CheckState.OK
-    assert results[0].summary == "Check completed"
-    assert (
-        results[0].details
-        == "<STDOUT>\nThis is printed to stdout\n\n</STDOUT>\n\n<STDERR>\nThis is printed to stderr\n\n</STDERR>"
-    )
-
-
-def test_decorated_function_with_list_of_results():
-    """Test a decorated function that returns a list of results."""
-
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def decorated_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return [
-            ok("First check passed"),
-            warn("Second check has a warning"),
-            crit("Third check failed"),
-        ]
-
-    # Run the check
-    results = decorated_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the results
-    assert len(results) == 3
-    assert results[0].check_state == CheckState.OK
-    assert results[0].summary == "First check passed"
-    assert results[1].check_state == CheckState.WARN
-    assert results[1].summary == "Second check has a warning"
-    assert results[2].check_state == CheckState.CRIT
-    assert results[2].summary == "Third check failed"
-
-
-def test_decorated_function_with_generator_of_results():
-    """Test a decorated function that returns a generator of results."""
-
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def decorated_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        yield ok("First check passed")
-        yield warn("Second check has a warning")
-        yield crit("Third check failed")
-
-    # Run the check
-    results = decorated_func.run_sync(
-        watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
-        environment=TEST_ENVIRONMENT,
-    )
-
-    # Verify the results
-    assert len(results) == 3
-    assert results[0].check_state == CheckState.OK
-    assert results[0].summary == "First check passed"
-    assert results[1].check_state == CheckState.WARN
-    assert results[1].summary == "Second check has a warning"
-    assert results[2].check_state == CheckState.CRIT
-    assert results[2].summary == "Third check failed"
+    assert isinstance(decorated_check, Check)
+    assert decorated_check.service_name == "test_service"
+    assert decorated_check.service_labels is SERVICE_LABELS
+    assert len(decorated_check.environments) == 1
+    assert decorated_check.environments[0].name == "test_env"
 
 
 def test_check_decorator_captures_invocation_information():
     """Test that the check decorator captures invocation information."""
 
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def decorated_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return ok("Test passed")
-
     # Verify that the decorated function has invocation information
-    assert decorated_func.invocation_information is not None
-    assert isinstance(decorated_func.invocation_information, InvocationInformation)
-    assert decorated_func.invocation_information.relative_path.endswith(
+    assert decorated_check.invocation_information is not None
+    assert isinstance(decorated_check.invocation_information, InvocationInformation)
+    assert decorated_check.invocation_information.relative_path.endswith(
         "tests/test_check.py"
     )
     # The line number should be the line where the decorator is applied
-    assert decorated_func.invocation_information.line_number > 0
+    assert decorated_check.invocation_information.line_number > 0
 
 
-def test_check_decorator_passes_invocation_information_to_execution_result():
+def test_check_decorator_passes_invocation_information_to_execution_result(datasources):
     """Test that the invocation information from the check decorator is passed to the ExecutionResult."""
 
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[TEST_ENVIRONMENT],
-        cache_for=None,
-    )
-    def decorated_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return ok("Test passed")
-
     # Run the check
-    results = decorated_func.run_sync(
+    results = decorated_check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=TEST_ENVIRONMENT,
     )
 
     # Verify the results
     assert len(results) == 1
     assert results[0].check_definition is not None
-    assert results[0].check_definition == decorated_func.invocation_information
+    assert results[0].check_definition == decorated_check.invocation_information
     assert results[0].check_definition.relative_path.endswith("tests/test_check.py")
     assert results[0].check_definition.line_number > 0
 
 
-def test_check_decorator_invocation_information_in_checkmk_output():
+def test_check_decorator_invocation_information_in_checkmk_output(datasources):
     """Test that the invocation information from the check decorator is included in the CheckMK output."""
 
-    @check(
-        name="test_service",
-        service_labels={"env": "test"},
-        environments=[Environment("test_env")],
-        cache_for=None,
-    )
-    def decorated_func(test_datasource: TestDatasource):
-        _ = test_datasource
-        return ok("Test passed")
-
     # Run the check
-    results = decorated_func.run_sync(
+    results = decorated_check.run_sync(
         watchpost=WATCHPOST,
-        datasources={
-            "test_datasource": TestDatasource(),
-        },
+        datasources=datasources,
         environment=TEST_ENVIRONMENT,
     )
 
-    # Generate the CheckMK output
-    output_generator = results[0].generate_checkmk_output()
-    output_bytes = b"".join(list(output_generator))
-    output_str = output_bytes.decode("utf-8")
-
-    # Extract and decode the base64 encoded JSON using the utility function
-    json_data = decode_checkmk_output(output_str)[0]
+    # Generate the CheckMK output and decode it, staying in bytes throughout
+    output_bytes = b"".join(results[0].generate_checkmk_output())
+    json_data = decode_checkmk_output(output_bytes)[0]
 
-    # Verify the output contains the check definition
-    assert "check_definition" in json_data
-    assert "relative_path" in json_data["check_definition"]
-    assert "line_number" in json_data["check_definition"]
+    # Verify the check definition survives the serialization roundtrip
+    invocation_information = decorated_check.invocation_information
+    assert invocation_information is not None
+    assert json_data["check_definition"] == {
+        "relative_path": invocation_information.relative_path,
+        "line_number": invocation_information.line_number,
+    }
     assert json_data["check_definition"]["relative_path"].endswith(
         "tests/test_check.py"
     )
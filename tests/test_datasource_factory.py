@@ -449,6 +449,33 @@ def test_watchpost_resolve_datasources_with_factory() -> None:
     assert datasource.config_value == "factory-created-test-service"
 
 
+def test_watchpost_resolve_datasources_reuses_resolution() -> None:
+    """Test that Watchpost._resolve_datasources inspects each check only once."""
+
+    def check_func(environment: Environment) -> CheckResult:
+        return ok(f"Environment: {environment.name}")
+
+    check_obj = Check(
+        check_function=check_func,
+        service_name="test-service",
+        service_labels={"env": "test"},
+        environments=[TEST_ENVIRONMENT],
+        cache_for=None,
+    )
+
+    app = Watchpost(
+        checks=[check_obj],
+        execution_environment=TEST_ENVIRONMENT,
+        executor=BlockingCheckExecutor(),
+    )
+
+    # A check without datasources resolves to an empty mapping, which has to be
+    # reused as well instead of inspecting the check again.
+    instantiable_datasources = app._resolve_datasources(check_obj)
+    assert instantiable_datasources == {}
+    assert app._resolve_datasources(check_obj) is instantiable_datasources
+
+
 def test_watchpost_run_checks_with_factory() -> None:
     """Test that Watchpost.run_checks correctly handles factory datasources."""
 
@@ -540,6 +567,32 @@ def test_fromfactory_cache_key() -> None:
     assert from_factory5.cache_key(TestFactory) != from_factory6.cache_key(TestFactory)
 
 
+def test_fromfactory_cache_key_hashes_arguments_once() -> None:
+    """Test that FromFactory.cache_key only hashes its arguments on first use."""
+
+    class CountingArgument:
+        def __init__(self) -> None:
+            self.hash_calls = 0
+
+        def __hash__(self) -> int:
+            self.hash_calls += 1
+            return 42
+
+    argument = CountingArgument()
+    from_factory = FromFactory(argument)
+
+    first_key = from_factory.cache_key(TestFactory)
+    second_key = from_factory.cache_key(TestFactory)
+
+    assert first_key == second_key
+    assert argument.hash_calls == 1
+    # The inferred factory type still comes from the given type key
+    assert from_factory.cache_key(ParameterizedTestFactory)[0] is (
+        ParameterizedTestFactory
+    )
+    assert argument.hash_calls == 1
+
+
 def test_annotated_with_non_fromfactory() -> None:
     """Test that using Annotated with something other than FromFactory raises a ValueError."""
 
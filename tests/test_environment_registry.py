@@ -16,6 +16,7 @@
 
 
 from watchpost.environment import Environment, EnvironmentRegistry
+from watchpost.hostname import TemplateStrategy
 
 
 def test_empty_registry_behavior():
@@ -80,8 +81,6 @@ def test_new_allows_hostname_and_sets_strategy():
     # Ensure the Environment received the hostname and strategy was set accordingly
     assert env.name == "with-hostname"
     # Strategy equality is identity-based; check properties instead
-    from watchpost.hostname import TemplateStrategy
-
     assert isinstance(env.hostname_strategy, TemplateStrategy)
     assert env.hostname_strategy.template == "some-host"
 
@@ -14,6 +14,7 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 from dataclasses import asdict
 from threading import Event
 
@@ -322,3 +323,50 @@ def test_errored_reports_and_clears_after_pickup():
         executor.result("key-err")
 
     assert executor.errored() == {}
+
+
+def test_asyncio_loop_is_not_eager_by_default():
+    executor = CheckExecutor(max_workers=1)
+
+    try:
+        assert executor.asyncio_loop.get_task_factory() is None
+    finally:
+        executor.shutdown(wait=True)
+
+
+def test_coroutines_run_on_an_eager_asyncio_loop():
+    executor = CheckExecutor(max_workers=1, eager_tasks=True)
+
+    async def async_job(*args, **kwargs):
+        return job(*args, **kwargs)
+
+    try:
+        assert executor.asyncio_loop.get_task_factory() is asyncio.eager_task_factory
+
+        future = executor.submit("key", async_job, "arg")
+        future.result(timeout=5)
+        assert executor.result("key") == {"args": ("arg",), "kwargs": {}}
+    finally:
+        executor.shutdown(wait=True)
+
+
+def test_coroutines_run_on_the_loop_from_loop_factory():
+    created_loops: list[asyncio.AbstractEventLoop] = []
+
+    def loop_factory() -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        created_loops.append(loop)
+        return loop
+
+    executor = CheckExecutor(max_workers=1, loop_factory=loop_factory)
+
+    async def async_job():
+        return asyncio.get_running_loop()
+
+    try:
+        future = executor.submit("key", async_job)
+        future.result(timeout=5)
+        assert executor.result("key") is created_loops[0]
+        assert len(created_loops) == 1
+    finally:
+        executor.shutdown(wait=True)
@@ -202,6 +202,57 @@ def test_invalid_disjoint_execution_environments():
     assert "Conflicting execution-environment constraints" in icc_exception.reason
 
 
+def test_subclassed_strategies_are_validated():
+    class MustRunFromMonitoring(MustRunInGivenExecutionEnvironmentStrategy):
+        pass
+
+    class MustRunFromPreprod(MustRunInGivenExecutionEnvironmentStrategy):
+        pass
+
+    strategies: list[SchedulingStrategy] = [
+        MustRunFromMonitoring(Monitoring),
+        MustRunFromPreprod(Preprod),
+    ]
+    execution_environment_strategies, target_environment_strategies, _ = (
+        DetectImpossibleCombinationStrategy._partition_strategies(strategies)
+    )
+    assert execution_environment_strategies == strategies
+    assert target_environment_strategies == []
+
+    class SubclassedMonitoring(Datasource):
+        scheduling_strategies = (MustRunFromMonitoring(Monitoring),)
+
+    class SubclassedPreprod(Datasource):
+        scheduling_strategies = (MustRunFromPreprod(Preprod),)
+
+    @check(
+        name="Disjoint subclassed exec envs",
+        service_labels={"test": "true"},
+        environments=[Monitoring],
+        cache_for=None,
+    )
+    def disjoint_subclassed_exec_envs(
+        _ds1: SubclassedMonitoring,
+        _ds2: SubclassedPreprod,
+    ) -> CheckResult:
+        raise AssertionError("Should not be executed in this verification test")
+
+    app = Watchpost(
+        checks=[disjoint_subclassed_exec_envs],
+        execution_environment=Monitoring,
+        executor=BlockingCheckExecutor(),
+    )
+    app.register_datasource(SubclassedMonitoring)
+    app.register_datasource(SubclassedPreprod)
+
+    with pytest.raises(ExceptionGroup) as exc_info:
+        app.verify_check_scheduling()
+
+    icc_exception = exc_info.value.exceptions[0]
+    assert isinstance(icc_exception, InvalidCheckConfiguration)
+    assert "Conflicting execution-environment constraints" in icc_exception.reason
+
+
 def test_skip_decision_is_selected_over_schedule():
     class AlwaysSkipStrategy(SchedulingStrategy):
         @override
@@ -356,3 +407,103 @@ def test_invalid_exec_and_target_envs_without_intersection_but_current_required(
     icc_exception = exception_group.exceptions[0]
     assert isinstance(icc_exception, InvalidCheckConfiguration)
     assert "Current=Target requirement cannot be satisfied" in icc_exception.reason
+
+
+def test_impossible_combination_is_detected_once_per_check():
+    class ExecMonitoring(Datasource):
+        scheduling_strategies = (
+            MustRunInGivenExecutionEnvironmentStrategy(Monitoring),
+        )
+
+    class ExecPreprod(Datasource):
+        scheduling_strategies = (MustRunInGivenExecutionEnvironmentStrategy(Preprod),)
+
+    @check(
+        name="Cached validation",
+        service_labels={"test": "true"},
+        environments=[Monitoring, Preprod],
+        cache_for=None,
+    )
+    def cached_validation(_ds1: ExecMonitoring, _ds2: ExecPreprod) -> CheckResult:
+        raise AssertionError("Should not be executed in this verification test")
+
+    strategy = DetectImpossibleCombinationStrategy()
+    app = Watchpost(
+        checks=[cached_validation],
+        execution_environment=Monitoring,
+        executor=BlockingCheckExecutor(),
+        default_scheduling_strategies=[strategy],
+    )
+    app.register_datasource(ExecMonitoring)
+    app.register_datasource(ExecPreprod)
+
+    validate_calls = 0
+    original_validate = strategy.validate
+
+    def counting_validate(check_to_validate):
+        nonlocal validate_calls
+        validate_calls += 1
+        original_validate(check_to_validate)
+
+    strategy.validate = counting_validate  # type: ignore[method-assign]
+
+    raised = []
+    with app.app_context():
+        for target_environment in (Monitoring, Preprod):
+            with pytest.raises(InvalidCheckConfiguration) as exc_info:
+                strategy.schedule(cached_validation, Monitoring, target_environment)
+            assert "Conflicting execution-environment constraints" in (
+                exc_info.value.reason
+            )
+            raised.append(exc_info.value)
+
+    assert validate_calls == 1
+    # Every call raises its own exception instead of re-raising a shared one
+    assert raised[0] is not raised[1]
+
+    # Forcing the verification validates the check again
+    with pytest.raises(ExceptionGroup):
+        app.verify_check_scheduling(force=True)
+    assert validate_calls == 2
+
+
+def test_impossible_combination_is_detected_per_app():
+    class ExecMonitoring(Datasource):
+        scheduling_strategies = (
+            MustRunInGivenExecutionEnvironmentStrategy(Monitoring),
+        )
+
+    @check(
+        name="Shared strategy",
+        service_labels={"test": "true"},
+        environments=[Monitoring],
+        cache_for=None,
+    )
+    def shared_strategy_check(_ds: ExecMonitoring) -> CheckResult:
+        raise AssertionError("Should not be executed in this verification test")
+
+    strategy = DetectImpossibleCombinationStrategy()
+    valid_app = Watchpost(
+        checks=[shared_strategy_check],
+        execution_environment=Monitoring,
+        executor=BlockingCheckExecutor(),
+        default_scheduling_strategies=[strategy],
+    )
+    valid_app.register_datasource(ExecMonitoring)
+    # The same check is invalid in this application, as its default strategies
+    # conflict with the datasource's.
+    invalid_app = Watchpost(
+        checks=[shared_strategy_check],
+        execution_environment=Monitoring,
+        executor=BlockingCheckExecutor(),
+        default_scheduling_strategies=[
+            strategy,
+            MustRunInGivenExecutionEnvironmentStrategy(Preprod),
+        ],
+    )
+    invalid_app.register_datasource(ExecMonitoring)
+
+    valid_app.verify_check_scheduling()
+    with pytest.raises(ExceptionGroup):
+        invalid_app.verify_check_scheduling()
+    valid_app.verify_check_scheduling(force=True)
@@ -31,3 +31,8 @@ def test_get_invocation_information():
     assert isinstance(invocation_information, InvocationInformation)
     assert invocation_information.relative_path == "tests/test_utils.py"
     assert invocation_information.line_number == expected_line_number + 1
+
+
+def test_get_invocation_information_is_shared_per_call_site():
+    invocation_informations = [return_invocation_information() for _ in range(2)]
+    assert invocation_informations[0] is invocation_informations[1]
@@ -15,15 +15,24 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import base64
+import inspect
 import json
 import re
 from collections.abc import Generator
 from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
 from threading import Event
 from typing import Any
 
+from watchpost.environment import Environment
+from watchpost.result import ExecutionResult
 
-def decode_checkmk_output(output: str | bytes) -> list[dict[str, Any]]:
+# Matches the base64 encoded payload between the watchpost markers.
+_WATCHPOST_SECTION_RE = re.compile(rb"<<<watchpost>>>\n(.*?)\n<<<<", re.DOTALL)
+
+
+def decode_checkmk_output(output: str | bytes | bytearray) -> list[dict[str, Any]]:
     """
     Decode base64 encoded JSON data from Checkmk output.
 
@@ -31,32 +40,24 @@ def decode_checkmk_output(output: str | bytes) -> list[dict[str, Any]]:
     that is contained between the watchpost markers in Checkmk output.
 
     Args:
-        output: The Checkmk output as a string or bytes
+        output: The Checkmk output as a string, bytes or bytearray
 
     Returns:
-        If there is only one result, returns a dictionary with the decoded JSON data.
-        If there are multiple results, returns a list of dictionaries.
+        A list of dictionaries, one per decoded watchpost section.
 
     Raises:
         ValueError: If no base64 encoded data is found in the output
     """
-    # Convert bytes to string if necessary
-    if isinstance(output, bytes):
-        output_str = output.decode("utf-8")
-    else:
-        output_str = output
-
-    # Find all base64 encoded parts between the watchpost markers
-    pattern = re.compile(r"<<<watchpost>>>\n(.*?)\n<<<<", re.DOTALL)
-    matches = pattern.finditer(output_str)
-
-    # Decode each match
-    results = []
-    for match in matches:
-        base64_data = match.group(1)
-        decoded_data = base64.b64decode(base64_data).decode("utf-8")
-        json_data = json.loads(decoded_data)
-        results.append(json_data)
+    # Work on bytes: both base64 and JSON decoding accept them directly
+    if isinstance(output, str):
+        output = output.encode("utf-8")
+
+    # Find all base64 encoded parts between the watchpost markers and decode them
+    payloads = [
+        base64.b64decode(match.group(1))
+        for match in _WATCHPOST_SECTION_RE.finditer(output)
+    ]
+    results = list(map(json.loads, payloads))
 
     if not results:
         raise ValueError("No base64 encoded data found in Checkmk output")
@@ -71,3 +72,35 @@ def with_event() -> Generator[Event]:
         yield event
     finally:
         event.set()
+
+
+@dataclass(eq=False)
+class StubCheck:
+    """
+    Lightweight stand-in for `Check` that returns predefined results.
+
+    Only the attributes `Watchpost` reads while scheduling and running a check
+    are provided. Instances hash by identity, just like the mocks they replace.
+    """
+
+    name: str = "stub"
+    service_name: str = "stub"
+    service_labels: dict[str, Any] = field(default_factory=dict)
+    environments: list[Environment] = field(default_factory=list)
+    cache_for: timedelta | None = None
+    result: list[ExecutionResult] = field(default_factory=list)
+    is_async: bool = False
+    scheduling_strategies: None = None
+    hostname_strategy: None = None
+    invocation_information: None = None
+    type_hints: dict[str, Any] = field(default_factory=dict)
+    signature: inspect.Signature = field(default_factory=inspect.Signature)
+    run_sync_calls: int = 0
+
+    @property
+    def environments_frozenset(self) -> frozenset[Environment]:
+        return frozenset(self.environments)
+
+    def run_sync(self, **_kwargs: Any) -> list[ExecutionResult]:
+        self.run_sync_calls += 1
+        return self.result